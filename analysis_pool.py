@@ -0,0 +1,151 @@
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", min(4, os.cpu_count() or 1)))
+ANALYSIS_TIMEOUT = float(os.environ.get("ANALYSIS_TIMEOUT", 60))
+
+class AnalysisTimeout(Exception):
+    """Raised when a resume takes longer than the per-job timeout to analyse."""
+
+
+def init_worker():
+    """Preload the pdfminer and spaCy stack so jobs never pay the import/model cost."""
+    import pdfminer3.pdfpage  # noqa: F401
+    import pdf_extract  # noqa: F401
+    import nlp_pipeline
+
+    nlp_pipeline.preload()
+
+
+def _warmup():
+    return os.getpid()
+
+
+def analyze_pdf_bytes(pdf_bytes):
+    """
+    Run the full extraction and parsing pipeline on raw PDF bytes. The
+    (start, end) wall-clock nanoseconds of each stage come back in
+    "stage_times" so the caller can trace work done in this process.
+    """
+    from pdf_extract import extract_pdf
+    from resume_parsing import parse_resume
+
+    started = time.time_ns()
+    extraction = extract_pdf(pdf_bytes)
+    extracted = time.time_ns()
+    resume_data = parse_resume(extraction)
+    return {
+        "resume_data": resume_data,
+        "resume_text": extraction.text,
+        "stage_times": {"pdf_reader": (started, extracted), "parse_resume": (extracted, time.time_ns())},
+    }
+
+
+def analyze_pdf_file(path):
+    """analyze_pdf_bytes for a PDF on disk, read through a read-only mmap instead of a copy."""
+    with open(path, "rb", buffering=0) as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return analyze_pdf_bytes(mapped)
+
+
+def analysis_job(pdf_bytes, path=None):
+    """
+    The (function, argument) sent to a worker. Given the path of a stored copy
+    the worker maps that file, so only the path is pickled across the pipe;
+    otherwise the bytes themselves are (without copying a view first).
+    """
+    if path is not None:
+        return analyze_pdf_file, path
+    if isinstance(pdf_bytes, memoryview) and isinstance(pdf_bytes.obj, bytes) and pdf_bytes.nbytes == len(pdf_bytes.obj):
+        return analyze_pdf_bytes, pdf_bytes.obj
+    return analyze_pdf_bytes, bytes(pdf_bytes)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = {}       # pool -> futures submitted to it
+_retiring = set()     # pools draining after a timeout
+
+
+def _pool_locked():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=ANALYSIS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+        # Start every worker now so the first uploads don't wait for model loading
+        for _ in range(ANALYSIS_WORKERS):
+            _executor.submit(_warmup)
+    return _executor
+
+
+def get_analysis_pool():
+    """Return the process-wide analysis pool, starting and warming its workers on first use."""
+    with _executor_lock:
+        return _pool_locked()
+
+
+def _submit(fn, arg):
+    """Submit a job to the current pool; return (pool, future)."""
+    with _executor_lock:
+        executor = _pool_locked()
+        future = executor.submit(fn, arg)
+        futures = _in_flight.setdefault(executor, set())
+        futures.add(future)
+    future.add_done_callback(futures.discard)
+    return executor, future
+
+
+def _retire_pool(executor, stuck):
+    """
+    Stop giving jobs to a pool with a stuck worker; new jobs go to a fresh
+    pool. Killing one worker would break the pool for every job on it, so the
+    other sessions' jobs are left to finish first.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+        if executor in _retiring:
+            return
+        _retiring.add(executor)
+        others = [future for future in list(_in_flight.get(executor, ())) if future is not stuck]
+    threading.Thread(target=_drain_pool, args=(executor, others), daemon=True).start()
+
+
+def _drain_pool(executor, others):
+    wait(others, timeout=ANALYSIS_TIMEOUT)
+    # ProcessPoolExecutor cannot cancel a running job, so the workers still busy (stuck) are terminated
+    for process in list(getattr(executor, "_processes", {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+    with _executor_lock:
+        _in_flight.pop(executor, None)
+        _retiring.discard(executor)
+
+
+def analyze_resume(pdf_bytes, timeout=ANALYSIS_TIMEOUT, path=None):
+    """
+    Analyse a resume in the worker pool, raising AnalysisTimeout if it takes
+    too long. Pass path when the same bytes are already on disk.
+    """
+    executor, future = _submit(*analysis_job(pdf_bytes, path))
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        _retire_pool(executor, future)
+        raise AnalysisTimeout(f"Resume analysis timed out after {timeout:.0f} seconds")
+
+
+def shutdown_analysis_pool():
+    """Stop the worker processes, e.g. at the end of a batch run."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
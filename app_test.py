@@ -1,38 +1,122 @@
 import streamlit as st
 import sys
 import os
-from supabase import create_client
-import Check
-from home_test import home
+import importlib
+from contextlib import nullcontext
+from pagination import paginated_list, reset_pagination
+import tracing
+import profiling
+import session_memory
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # Add the project root directory to the Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-# Add some error handling for imports
-try:
-    from home_test import home
-    from pages.login_test import login
-    from pages.sign_test import signup  # type: ignore 
-    from upload import upload  # type: ignore
-    from feedback import feedback  # type: ignore
-    from application_overview import application_overview  # type: ignore
-    from applied_jobs import main as applied_jobs
-    from about_us import about_us  # type: ignore
-    from apply import apply
-    from job_list import job_list
-except ImportError as e:
-    st.error(f"Import error: {e}")
-    st.stop()
-
-def init_supabase():
-    try:
-        supabase_url = st.secrets["SUPABASE_URL"]
-        supabase_key = st.secrets["SUPABASE_KEY"]
-        return create_client(supabase_url, supabase_key)
-    except Exception as e:
-        st.error(f"Failed to initialize Supabase client: {e}")
-        st.stop()
+# page -> (module, functions to call). Modules are imported on first navigation,
+# so a cold start only pays for the page that is actually shown.
+PAGES = {
+    "home": ("home_test", ["home"]),
+    "login": ("pages.login_test", ["login"]),
+    "signup": ("pages.sign_test", ["signup"]),
+    "check": ("Check", ["check", "run"]),
+    "upload": ("upload", ["upload"]),
+    "feedback": ("feedback", ["feedback"]),
+    "application_overview": ("application_overview", ["application_overview"]),
+    "applied_jobs": ("applied_jobs", ["main"]),
+    "about_us": ("about_us", ["about_us"]),
+    "apply": ("apply", ["apply"]),
+    "job_list": ("job_list", ["job_list"]),
+}
+
+def load_page(page):
+    """Import a page's module on first use and return its render functions."""
+    module_name, function_names = PAGES[page]
+    if module_name not in sys.modules:
+        # The first-use import cost shows up as its own span in the rerun's trace
+        with tracing.span(f"import {module_name}"):
+            importlib.import_module(module_name)
+    module = sys.modules[module_name]
+    return [getattr(module, name) for name in function_names]
+
+
+def profiling_requested():
+    """True for a session opened with ?profile=<PROFILE_TOKEN>, until ?profile=off."""
+    value = st.query_params.get("profile")
+    if value == "off":
+        st.session_state.pop("profile_session", None)
+    elif profiling.PROFILE_TOKEN and value == profiling.PROFILE_TOKEN:
+        st.session_state["profile_session"] = True
+    return st.session_state.get("profile_session", False)
+
+def render_page(page):
+    with tracing.span(f"page {page}", kind="page", page=page):
+        try:
+            functions = load_page(page)
+        except ImportError as e:
+            st.error(f"Import error: {e}")
+            st.stop()
+        # Only the opted-in session's page calls run under the profiler
+        profiler = nullcontext()
+        if profiling_requested():
+            ctx = get_script_run_ctx()
+            profiler = profiling.profiled(f"{page}_{ctx.session_id[:8] if ctx else 'bare'}")
+        with profiler as result:
+            if result is not None:
+                st.session_state["last_profile"] = result
+                session_memory.mark_evictable(st.session_state, "last_profile")
+            for function in functions:
+                function()
+
+def render_trace_panel():
+    """Sidebar breakdown of this rerun's spans, shown once ?trace=1 has been opened in the session."""
+    if st.query_params.get("trace") == "1":
+        st.session_state["show_trace_panel"] = True
+    trace = tracing.current_trace()
+    if not st.session_state.get("show_trace_panel") or trace is None:
+        return
+    with st.sidebar.expander("⏱ This rerun", expanded=True):
+        lines = []
+        for depth, span in trace.breakdown():
+            slow = span.kind == "db" and span.duration_ms > tracing.SLOW_QUERY_MS
+            lines.append(f"{'&nbsp;' * 4 * depth}{'🐢 ' if slow else ''}`{span.name}` {span.duration_ms:.1f} ms")
+        st.markdown("  \n".join(lines), unsafe_allow_html=True)
+
+def render_profile_panel():
+    """Sidebar summary of the last profiled page call in a profiling session."""
+    result = st.session_state.get("last_profile")
+    if not st.session_state.get("profile_session") or result is None:
+        return
+    with st.sidebar.expander(f"🔬 Profile: {result.label}", expanded=False):
+        st.caption(f"{result.total_s:.3f} s profiled, saved to {result.prof_path}")
+        st.code(result.summary, language=None)
+
+def account_session_memory():
+    """Record this session's footprint and reclaim memory if it is over budget."""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with tracing.span("session memory"):
+        session_memory.enforce_budget(st.session_state, ctx.session_id)
+
+def render_memory_panel():
+    """Sidebar breakdown of the session's footprint as of its last accounting, shown once ?memory=1 has been opened."""
+    if st.query_params.get("memory") == "1":
+        st.session_state["show_memory_panel"] = True
+    ctx = get_script_run_ctx()
+    report = session_memory.get_memory_tracker().report(ctx.session_id) if ctx else None
+    if not st.session_state.get("show_memory_panel") or report is None:
+        return
+    total, breakdown, evicted = report
+    with st.sidebar.expander(f"🧠 Memory: {total / 1024 / 1024:.1f} MB", expanded=False):
+        largest = sorted(breakdown.items(), key=lambda item: item[1], reverse=True)[:10]
+        st.markdown("  \n".join(f"`{key}` {size / 1024:.1f} KB" for key, size in largest))
+        if evicted:
+            st.caption(f"Evicted to stay within budget: {', '.join(evicted)}")
+        totals = session_memory.get_memory_tracker().totals()
+        st.caption(f"Process: {totals['sessions']} sessions, {totals['total_bytes'] / 1024 / 1024:.1f} MB "
+                   f"(budget {session_memory.PROCESS_MEMORY_BUDGET_MB:g} MB, "
+                   f"{session_memory.SESSION_MEMORY_BUDGET_MB:g} MB per session)")
 
 def create_header():
     if st.session_state.get("logged_in", False):
@@ -72,45 +156,49 @@ def create_header():
         </style>
         """, unsafe_allow_html=True)
 
-def perform_job_search(search_query, search_type):
+# Fields of the job search index each search type looks at (None means all of them)
+SEARCH_TYPE_FIELDS = {
+    "all": None,
+    "location": ["city", "state"],
+    "job_title": ["job_title"],
+    "job_subject": ["job_subject"],
+}
+
+def perform_job_search(search_query, search_type, limit=50):
+    # Imported here: the index and the Supabase client cost ~0.5s of cold start
+    from job_index import get_job_index
+    from repositories import get_repositories
+
     try:
-        supabase = init_supabase()
-        
-        if search_type == "location":
-            response = supabase.table('job_listings').select('*').or_(
-                f"city.ilike.%{search_query}%,state.ilike.%{search_query}%"
-            ).execute()
-        elif search_type == "job_title":
-            response = supabase.table('job_listings').select('*').ilike(
-                'job_title', f'%{search_query}%'
-            ).execute()
-        elif search_type == "job_subject":
-            response = supabase.table('job_listings').select('*').ilike(
-                'job_subject', f'%{search_query}%'
-            ).execute()
-            
-        return response.data
+        # Answered from the in-process trigram index instead of ilike '%q%' scans
+        job_index = get_job_index()
+        job_index.refresh(get_repositories().job_listings)
+        return job_index.search(search_query, fields=SEARCH_TYPE_FIELDS[search_type], limit=limit)
     except Exception as e:
         st.error(f"Database error: {e}")
         return []
 
-def display_search_results(results):
+def render_search_result(job):
+    with st.expander(f"{job['job_title']} - {job['city']}, {job['state']}"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Job Title:** {job['job_title']}")
+            st.write(f"**Subject:** {job['job_subject']}")
+            st.write(f"**Location:** {job['city']}, {job['state']}")
+        with col2:
+            st.write(f"**Company:** {job.get('company', 'N/A')}")
+            st.write(f"**Salary Range:** {job.get('salary_range', 'Not specified')}")
+
+def display_search_results(search_query, search_type):
+    def fetch_page(offset, limit):
+        # The index returns the best offset + limit matches; this page is their tail
+        offset = offset or 0
+        return perform_job_search(search_query, search_type, limit=offset + limit)[offset:]
+
+    st.subheader("Matching Job Listings")
+    results = paginated_list("job_search", fetch_page, render_search_result)
     if not results:
         st.warning("No job listings found matching your search.")
-        return
-    
-    st.subheader(f"Found {len(results)} Job Listing(s)")
-    
-    for job in results:
-        with st.expander(f"{job['job_title']} - {job['city']}, {job['state']}"):
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"**Job Title:** {job['job_title']}")
-                st.write(f"**Subject:** {job['job_subject']}")
-                st.write(f"**Location:** {job['city']}, {job['state']}")
-            with col2:
-                st.write(f"**Company:** {job.get('company', 'N/A')}")
-                st.write(f"**Salary Range:** {job.get('salary_range', 'Not specified')}")
 
 def create_search_bar():
     if st.session_state.get("logged_in", False):
@@ -124,22 +212,27 @@ def create_search_bar():
             # Use a unique key for the search type
             search_type = st.selectbox(
                 "Search By", 
-                ["Location", "Job Title", "Job Subject"],
+                ["All Fields", "Location", "Job Title", "Job Subject"],
                 key="search_type"
             )
 
         if st.button("Search Jobs", key="search_jobs_button"):
             if search_query:
                 type_map = {
+                    "All Fields": "all",
                     "Location": "location",
                     "Job Title": "job_title", 
                     "Job Subject": "job_subject"
                 }
-                results = perform_job_search(search_query, type_map[search_type])
-                display_search_results(results)
+                # Keep the search across reruns so its result pages can be browsed
+                st.session_state["job_search"] = (search_query, type_map[search_type])
+                reset_pagination("job_search")
             else:
                 st.warning("Please enter a search term")
 
+        if st.session_state.get("job_search"):
+            display_search_results(*st.session_state["job_search"])
+
 def logout_user():
     st.session_state["logged_in"] = False
     st.session_state["email"] = None
@@ -294,31 +387,17 @@ def main():
             if st.button("ⓘ  About Us", key="about_us_button", use_container_width=True):
                 st.session_state["page"] = "about_us"
                 st.rerun()
+    if st.session_state.pop(session_memory.UPLOADS_RELEASED_KEY, False):
+        st.warning("Your uploaded file was released to free memory. Please upload it again.")
+
     # Page routing
-    if st.session_state.get("page") == "home":
-        home()
-    elif st.session_state.get("page") == "login":
-        login()
-    elif st.session_state.get("page") == "signup":
-        signup()
-    elif st.session_state.get("page") == "check":
-        Check.check()
-        Check.run()
-    elif st.session_state.get("page") == "upload":
-        upload()
-    elif st.session_state.get("page") == "feedback":
-        feedback()
-    elif st.session_state.get("page") == "application_overview":
-        application_overview()  # Redirect to application_overview.py
-    elif st.session_state.get("page") == "applied_jobs":
-        applied_jobs()  # Redirect to applied_jobs.py
-    elif st.session_state.get("page") == "about_us":
-        about_us()  # Redirect to about_us.py
-    elif st.session_state.get("page") == "apply":
-        apply()  # Call the apply function
-    elif st.session_state.get("page") == "job_list":
-        job_list()
-      
+    if st.session_state.get("page") in PAGES:
+        render_page(st.session_state["page"])
+
+    render_trace_panel()
+    render_profile_panel()
+    render_memory_panel()
+
 if __name__ == "__main__":
     # Initialize session state variables if not already present
     if "logged_in" not in st.session_state:
@@ -332,4 +411,9 @@ if __name__ == "__main__":
     if "username" not in st.session_state:
         st.session_state["username"] = None
 
-    main()
+    with tracing.trace_rerun(page=st.session_state["page"]):
+        try:
+            main()
+        finally:
+            # Also after reruns that end in st.rerun()/st.stop()
+            account_session_memory()
@@ -1,31 +1,10 @@
 import streamlit as st
-from supabase import create_client
+from repositories import get_repositories
 import pandas as pd
 
-def get_db_connection():
-    try:
-        supabase_url = st.secrets["SUPABASE_URL"]
-        supabase_key = st.secrets["SUPABASE_KEY"]
-        return create_client(supabase_url, supabase_key)
-    except Exception as e:
-        st.error(f"Error connecting to Supabase: {e}")
-        return None
-
 def fetch_applied_jobs(user_id):
-    supabase = get_db_connection()
-    if not supabase:
-        return []
-
     try:
-        # Using Supabase's query builder to join tables and fetch data
-        response = supabase.rpc(
-            'get_applied_jobs',  # Name of the stored procedure we'll create
-            {'user_id_param': user_id}
-        ).execute()
-
-        if response.data:
-            return response.data
-        return []
+        return get_repositories().job_applications.list_for_user(user_id)
     except Exception as e:
         st.error(f"Error fetching jobs: {e}")
         return []
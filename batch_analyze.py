@@ -0,0 +1,281 @@
+"""
+Headless bulk resume analysis.
+
+Runs the same pipeline as the Check page (single-pass PDF extraction, resume
+parsing, field classification and score rules) over every PDF in the given
+directories and streams one record per resume to JSONL or Parquet.
+Re-running with the same output skips resumes that were already analysed.
+
+    python batch_analyze.py resume_store Uploaded_Resumes uploads --output results.jsonl --workers 8
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from analysis_pool import init_worker, analyze_pdf_bytes
+from parse_cache import get_parse_cache
+from resume_scoring import classify_field, candidate_level, score_resume
+from resume_store import RESUME_STORE_DIR
+
+# The resume store, plus the directories uploads were written to before it
+DEFAULT_INPUTS = [RESUME_STORE_DIR, 'Uploaded_Resumes', 'uploads']
+
+RECORD_FIELDS = [
+    'path', 'sha256', 'name', 'email', 'mobile_number', 'skills', 'no_of_pages',
+    'cand_level', 'reco_field', 'recommended_skills', 'resume_score', 'sections',
+    'analyzed_at', 'elapsed_s', 'error',
+]
+
+
+def find_pdfs(inputs):
+    """Return every PDF under the given files/directories, in a stable order."""
+    found = []
+    for item in inputs:
+        if os.path.isfile(item) and item.lower().endswith('.pdf'):
+            found.append(item)
+            continue
+        for root, _, filenames in os.walk(item):
+            for filename in filenames:
+                if filename.lower().endswith('.pdf'):
+                    found.append(os.path.join(root, filename))
+    return sorted(set(found))
+
+
+def analyze_file(path):
+    """Analyse one PDF and return a flat, serialisable record."""
+    started = time.perf_counter()
+    record = dict.fromkeys(RECORD_FIELDS)
+    record['path'] = path
+    try:
+        with open(path, 'rb') as f:
+            pdf_bytes = f.read()
+        record['sha256'] = hashlib.sha256(pdf_bytes).hexdigest()
+
+        parse_cache = get_parse_cache()
+        result = parse_cache.get(pdf_bytes)
+        if result is None:
+            result = analyze_pdf_bytes(pdf_bytes)
+            if result['resume_data']:
+                parse_cache.put(pdf_bytes, {'resume_data': result['resume_data'], 'resume_text': result['resume_text']})
+
+        resume_data, resume_text = result['resume_data'], result['resume_text']
+        skills = resume_data.get('skills') or []
+        reco_field, recommended_skills = classify_field(skills, resume_text)
+        resume_score, sections = score_resume(resume_text)
+        record.update({
+            'name': resume_data.get('name'),
+            'email': resume_data.get('email'),
+            'mobile_number': resume_data.get('mobile_number'),
+            'skills': skills,
+            'no_of_pages': resume_data.get('no_of_pages'),
+            'cand_level': candidate_level(resume_data.get('no_of_pages'), len(skills)),
+            'reco_field': reco_field,
+            'recommended_skills': recommended_skills,
+            'resume_score': resume_score,
+            'sections': [section for section, found in sections.items() if found],
+        })
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['analyzed_at'] = datetime.datetime.now().isoformat(timespec='seconds')
+    record['elapsed_s'] = round(time.perf_counter() - started, 4)
+    return record
+
+
+class JsonlWriter:
+    """Append records to a JSON Lines file, one flushed line per resume."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def done_records(self):
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a torn last line from an interrupted run
+                done[record['path']] = record.get('error')
+        return done
+
+    def __enter__(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def write(self, record):
+        self._file.write(json.dumps(record, default=str) + '\n')
+        self._file.flush()
+
+    def flush(self):
+        pass  # every line is flushed as it is written
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Write records as numbered Parquet part files inside a dataset directory."""
+
+    def __init__(self, path, batch_size=500):
+        import pyarrow as pa
+
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = []
+        self._schema = pa.schema([
+            ('path', pa.string()),
+            ('sha256', pa.string()),
+            ('name', pa.string()),
+            ('email', pa.string()),
+            ('mobile_number', pa.string()),
+            ('skills', pa.list_(pa.string())),
+            ('no_of_pages', pa.int64()),
+            ('cand_level', pa.string()),
+            ('reco_field', pa.string()),
+            ('recommended_skills', pa.list_(pa.string())),
+            ('resume_score', pa.int64()),
+            ('sections', pa.list_(pa.string())),
+            ('analyzed_at', pa.string()),
+            ('elapsed_s', pa.float64()),
+            ('error', pa.string()),
+        ])
+
+    def _parts(self):
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path) if name.endswith('.parquet'))
+
+    def done_records(self):
+        import pyarrow.parquet as pq
+
+        done = {}
+        for name in self._parts():
+            table = pq.read_table(os.path.join(self.path, name), columns=['path', 'error'])
+            for path, error in zip(table.column('path').to_pylist(), table.column('error').to_pylist()):
+                done[path] = error
+        return done
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._next_part = len(self._parts())
+        return self
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        table = pa.Table.from_pylist(self._buffer, schema=self._schema)
+        part_path = os.path.join(self.path, f'part-{self._next_part:05d}.parquet')
+        # Write under a temporary name so an interrupted flush never leaves a corrupt part
+        pq.write_table(table, part_path + '.tmp')
+        os.replace(part_path + '.tmp', part_path)
+        self._next_part += 1
+        self._buffer = []
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def open_writer(output, batch_size):
+    if output.endswith('.parquet'):
+        return ParquetWriter(output, batch_size=batch_size)
+    return JsonlWriter(output)
+
+
+def run_batch(inputs, output, workers, batch_size=500, retry_errors=False, progress_every=50):
+    """Analyse every pending PDF and return a summary of the run."""
+    writer = open_writer(output, batch_size)
+    done = writer.done_records()
+    pdfs = find_pdfs(inputs)
+    pending = [path for path in pdfs if path not in done or (retry_errors and done[path])]
+    print(f"Found {len(pdfs)} PDFs, {len(pdfs) - len(pending)} already analysed, {len(pending)} to go.", file=sys.stderr)
+
+    # Every worker has its own parse cache over the same directory; this process
+    # trims the directory as results come in so MAX_CACHE_BYTES bounds the whole run
+    parse_cache = get_parse_cache()
+    processed = failed = 0
+    interrupted = False
+    started = time.perf_counter()
+    with writer, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker,
+    ) as executor:
+        todo = iter(pending)
+        in_flight = set()
+        try:
+            # Keep a bounded number of jobs queued so huge archives don't build a huge future list
+            while True:
+                while len(in_flight) < workers * 2:
+                    path = next(todo, None)
+                    if path is None:
+                        break
+                    in_flight.add(executor.submit(analyze_file, path))
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    writer.write(record)
+                    processed += 1
+                    failed += bool(record['error'])
+                    if processed % progress_every == 0:
+                        parse_cache.trim()
+                        rate = processed / (time.perf_counter() - started)
+                        print(f"  {processed}/{len(pending)} files, {rate:.2f} files/s", file=sys.stderr)
+        except KeyboardInterrupt:
+            # Save the finished records (including a partial Parquet part) so a re-run resumes after them
+            interrupted = True
+            writer.flush()
+            executor.shutdown(wait=False, cancel_futures=True)
+    parse_cache.trim()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'found': len(pdfs),
+        'skipped': len(pdfs) - len(pending),
+        'processed': processed,
+        'failed': failed,
+        'interrupted': interrupted,
+        'elapsed_s': round(elapsed, 2),
+        'files_per_s': round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score archived resumes without the Streamlit UI.")
+    parser.add_argument('inputs', nargs='*', default=DEFAULT_INPUTS, help="PDF files or directories to scan")
+    parser.add_argument('--output', '-o', default='batch_results.jsonl',
+                        help="JSONL file, or a directory ending in .parquet for Parquet part files")
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=500, help="records per Parquet part file")
+    parser.add_argument('--retry-errors', action='store_true', help="re-analyse resumes that failed last time")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.inputs, args.output, args.workers, args.batch_size, args.retry_errors)
+    if summary['interrupted']:
+        print(f"Interrupted; {summary['processed']} results saved to {args.output}, run again to resume.",
+              file=sys.stderr)
+        return 130
+    print(f"Processed {summary['processed']} files ({summary['failed']} failed, {summary['skipped']} skipped) "
+          f"in {summary['elapsed_s']}s: {summary['files_per_s']} files/s", file=sys.stderr)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+"""
+Multi-session load test for the Streamlit app.
+
+Starts the PostgREST stub (benchmarks/postgrest_stub.py) with the requested
+latency, runs `streamlit run app_test.py` against it, and drives simulated
+users through Streamlit's own websocket protocol, the same messages a
+browser tab sends. Each user runs the job seeker journey:
+
+    home -> login -> Check (upload a synthetic resume) -> apply for the
+    first recommendation -> applied jobs -> log out
+
+Concurrency ramps through --levels; at each level that many users run
+--iterations journeys at once. For every level it reports p50/p99 rerun
+latency (from sending a rerun until the script finishes), the error rate
+(exceptions shown by the app, timeouts and dropped connections), journeys/s
+and server CPU seconds per journey (Linux, whole process tree, so the
+analysis workers are included).
+
+    python -m benchmarks.load_test --levels 1 2 4 8 16 --latency-ms 40 --output bench_load.json
+
+AppTest can't be used here: it swaps the global Runtime instance on every
+run, so sessions in one process can't run concurrently.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.websocket import websocket_connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import FileURLs, FileUploaderState, UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from benchmarks.pipeline import percentile
+from benchmarks.postgrest_stub import STUB_KEY, LOAD_TEST_PASSWORD, load_test_user, start_stub
+from benchmarks.synthetic_resumes import make_pdf, synthetic_resume
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LEVELS = [1, 2, 4, 8, 16]
+RERUN_TIMEOUT = 120.0
+MAX_MESSAGE_SIZE = 200 * 1024 * 1024   # Check and apply embed the PDF in the page
+
+
+class SessionError(Exception):
+    """A rerun that timed out, lost its connection or rendered an exception."""
+
+    def __init__(self, kind, message):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+
+
+class StreamlitSession:
+    """One simulated browser tab speaking Streamlit's websocket protocol."""
+
+    def __init__(self, base_url, timeout=RERUN_TIMEOUT):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session_id = None
+        self.elements = {}
+        self.latencies = []
+        self._widget_states = {}
+        self._message_cache = {}
+        self._ws = None
+
+    async def connect(self):
+        ws_url = self.base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self._ws = await websocket_connect(HTTPRequest(ws_url), subprotocols=["streamlit"],
+                                           max_message_size=MAX_MESSAGE_SIZE)
+        return await self.rerun("open")
+
+    def close(self):
+        if self._ws is not None:
+            self._ws.close()
+
+    async def _send(self, back_msg):
+        await self._ws.write_message(back_msg.SerializeToString(), binary=True)
+
+    async def _receive(self):
+        data = await asyncio.wait_for(self._ws.read_message(), self.timeout)
+        if data is None:
+            raise SessionError("disconnected", "the server closed the websocket")
+        msg = ForwardMsg()
+        msg.ParseFromString(data)
+        if msg.WhichOneof("type") == "ref_hash":
+            msg = self._message_cache[msg.ref_hash]
+        elif msg.metadata.cacheable:
+            self._message_cache[msg.hash] = msg
+        return msg
+
+    async def rerun(self, step, trigger=None):
+        """Rerun the script with the current widget values (plus a one-off trigger); return its latency."""
+        back_msg = BackMsg()
+        client_state = back_msg.rerun_script
+        client_state.widget_states.widgets.extend(self._widget_states.values())
+        if trigger is not None:
+            client_state.widget_states.widgets.append(trigger)
+
+        started = time.perf_counter()
+        await self._send(back_msg)
+        try:
+            # st.rerun() ends a run early and starts another; wait for the run that completes
+            while True:
+                msg = await self._receive()
+                kind = msg.WhichOneof("type")
+                if kind == "new_session":
+                    self.session_id = msg.new_session.initialize.session_id
+                    self.elements = {}
+                elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                    self.elements[tuple(msg.metadata.delta_path)] = msg.delta.new_element
+                elif kind == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+        except asyncio.TimeoutError:
+            raise SessionError("timeout", f"{step} did not finish within {self.timeout:g}s")
+        latency = time.perf_counter() - started
+        self.latencies.append((step, latency))
+
+        for element in self.elements.values():
+            if element.WhichOneof("type") == "exception":
+                raise SessionError("exception", f"{step}: {element.exception.type}: {element.exception.message}")
+        return latency
+
+    def _widgets(self, kind):
+        for element in self.elements.values():
+            if element.WhichOneof("type") == kind:
+                yield getattr(element, kind)
+
+    def find(self, kind, key=None, label=None, key_prefix=None):
+        """The first widget of a kind with the given user key, key prefix or label, or None."""
+        for widget in self._widgets(kind):
+            user_key = widget.id.rsplit("-", 1)[-1]
+            if (key is not None and user_key == key) or (label is not None and widget.label == label) \
+                    or (key_prefix is not None and user_key.startswith(key_prefix)):
+                return widget
+        return None
+
+    def alerts(self):
+        return [alert.body for alert in self._widgets("alert")]
+
+    def _require(self, kind, **match):
+        widget = self.find(kind, **match)
+        if widget is None:
+            raise SessionError("missing_widget", f"no {kind} matching {match}; alerts: {self.alerts()}")
+        return widget
+
+    async def click(self, step, **match):
+        widget = self._require("button", **match)
+        return await self.rerun(step, WidgetState(id=widget.id, trigger_value=True))
+
+    async def set_value(self, step, kind, value_field, value, **match):
+        widget = self._require(kind, **match)
+        self._widget_states[widget.id] = WidgetState(id=widget.id, **{value_field: value})
+        return await self.rerun(step)
+
+    async def upload(self, step, filename, data, **match):
+        """Upload a file the way the browser does (request URLs, PUT the file), then rerun."""
+        widget = self._require("file_uploader", **match)
+        request_id = uuid.uuid4().hex
+        back_msg = BackMsg()
+        back_msg.file_urls_request.request_id = request_id
+        back_msg.file_urls_request.session_id = self.session_id
+        back_msg.file_urls_request.file_names.append(filename)
+        await self._send(back_msg)
+        while True:
+            msg = await self._receive()
+            if msg.WhichOneof("type") == "file_urls_response" and msg.file_urls_response.response_id == request_id:
+                file_urls = msg.file_urls_response.file_urls[0]
+                break
+
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"{filename}\"; filename=\"{filename}\"\r\n"
+                f"Content-Type: application/pdf\r\n\r\n").encode() + data + f"\r\n--{boundary}--\r\n".encode()
+        await AsyncHTTPClient().fetch(self.base_url + file_urls.upload_url, method="PUT", body=body,
+                                      headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                                      request_timeout=self.timeout)
+
+        state = FileUploaderState(max_file_id=0)
+        state.uploaded_file_info.append(UploadedFileInfo(
+            name=filename, size=len(data), file_id=file_urls.file_id,
+            file_urls=FileURLs(file_id=file_urls.file_id, upload_url=file_urls.upload_url,
+                               delete_url=file_urls.delete_url),
+        ))
+        self._widget_states[widget.id] = WidgetState(id=widget.id, file_uploader_state_value=state)
+        return await self.rerun(step)
+
+
+async def job_seeker_journey(base_url, email, resume_pdf, timeout=RERUN_TIMEOUT):
+    """Run one user's journey; return (rerun latencies, skipped steps)."""
+    session = StreamlitSession(base_url, timeout)
+    skipped = []
+    try:
+        await session.connect()
+        await session.click("open_login", key="login_button")
+        await session.set_value("enter_email", "text_input", "string_value", email, key="login_email")
+        await session.set_value("enter_password", "text_input", "string_value", LOAD_TEST_PASSWORD,
+                                key="login_password")
+        await session.click("login", key="login_submit")
+        await session.click("open_check", key="check_button")
+        await session.upload("analyse_resume", "resume.pdf", resume_pdf, label="Choose your Resume (PDF)")
+
+        if session.find("button", key_prefix="apply_") is None:
+            # No recommendations (e.g. the analysis failed); the rest of the journey still runs
+            skipped.append("apply")
+        else:
+            await session.click("open_apply", key_prefix="apply_")
+            await session.upload("apply_upload", "resume.pdf", resume_pdf, key="resume_uploader")
+            await session.click("apply_details", key="next_step_1")
+            await session.set_value("teaching_style", "text_area", "string_value", "Patient, example-led lessons.",
+                                    key="teaching_style_input")
+            await session.click("apply_review", key="proceed_to_review")
+            await session.set_value("confirm", "checkbox", "bool_value", True, key="confirmation_checkbox")
+            await session.click("submit_application", key="submit_application")
+
+        await session.click("applied_jobs", key="applied_jobs_button")
+        await session.click("logout", key="logout_button")
+        return session.latencies, skipped
+    except SessionError as e:
+        e.latencies = session.latencies
+        raise
+    finally:
+        session.close()
+
+
+def process_tree_cpu(pid):
+    """User + system CPU seconds of a process and all its descendants (Linux only, else None)."""
+    ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    try:
+        stats = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        fields = f.read().rsplit(")", 1)[1].split()
+                except OSError:
+                    continue
+                stats[int(entry)] = (int(fields[1]), int(fields[11]) + int(fields[12]))
+    except OSError:
+        return None
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += stats.get(current, (0, 0))[1]
+        stack.extend(child for child, (ppid, _) in stats.items() if ppid == current)
+    return total / ticks
+
+
+async def run_level(base_url, concurrency, iterations, resume_pdf, user_offset, timeout):
+    """Run concurrency users, each doing iterations journeys; return their outcomes."""
+    async def user(index):
+        outcomes = []
+        for _ in range(iterations):
+            try:
+                latencies, skipped = await job_seeker_journey(
+                    base_url, load_test_user(user_offset + index), resume_pdf, timeout)
+                outcomes.append({"latencies": latencies, "skipped": skipped, "error": None})
+            except Exception as e:
+                kind = getattr(e, "kind", type(e).__name__)
+                outcomes.append({"latencies": getattr(e, "latencies", []), "skipped": [], "error": (kind, str(e))})
+        return outcomes
+
+    results = await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return [outcome for outcomes in results for outcome in outcomes]
+
+
+def summarize_level(concurrency, outcomes, elapsed, cpu_seconds):
+    latencies = [latency for outcome in outcomes for _, latency in outcome["latencies"]]
+    errors = {}
+    for outcome in outcomes:
+        if outcome["error"]:
+            errors[outcome["error"][0]] = errors.get(outcome["error"][0], 0) + 1
+    steps = {}
+    for outcome in outcomes:
+        for step, latency in outcome["latencies"]:
+            steps.setdefault(step, []).append(latency)
+    reruns = len(latencies) + sum(errors.values())
+    return {
+        "concurrency": concurrency,
+        "journeys": len(outcomes),
+        "reruns": reruns,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "error_rate": round(sum(errors.values()) / reruns, 4) if reruns else 0.0,
+        "errors": errors,
+        "first_errors": [outcome["error"][1] for outcome in outcomes if outcome["error"]][:3],
+        "skipped": sorted({step for outcome in outcomes for step in outcome["skipped"]}),
+        "journeys_per_s": round(len(outcomes) / elapsed, 3) if elapsed > 0 else None,
+        "cpu_s_per_journey": round(cpu_seconds / len(outcomes), 3) if cpu_seconds is not None and outcomes else None,
+        "steps_p50_ms": {step: round(percentile(values, 50) * 1000, 1) for step, values in steps.items()},
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(port, supabase_url, extra_env=None):
+    """Run the app under `streamlit run` against the stub; return the process once it is healthy."""
+    env = {**os.environ, "SUPABASE_URL": supabase_url, "SUPABASE_KEY": STUB_KEY, "DATA_BACKEND": "supabase",
+           **(extra_env or {})}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app_test.py", "--server.port", str(port),
+         "--server.headless", "true", "--server.enableXsrfProtection", "false", "--server.enableCORS", "false",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited: {process.stderr.read().decode(errors='replace')[-2000:]}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError("streamlit did not start within 60s")
+
+
+def print_levels(levels):
+    print(f"{'users':>6}{'journeys':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>9}{'journeys/s':>12}{'CPU s/journey':>15}")
+    for level in levels:
+        print(f"{level['concurrency']:>6}{level['journeys']:>10}{str(level['p50_ms']):>10}{str(level['p99_ms']):>10}"
+              f"{level['error_rate']:>9.1%}{str(level['journeys_per_s']):>12}{str(level['cpu_s_per_journey']):>15}")
+        for error in level["first_errors"]:
+            print(f"        {error[:160]}")
+
+
+async def run_load_test(levels, iterations, latency_ms, jitter_ms, users, listings, bcrypt_rounds, timeout,
+                        max_p99_ms=None, max_error_rate=0.5):
+    stub, supabase_url = start_stub(0, latency_ms, jitter_ms, users, listings, bcrypt_rounds=bcrypt_rounds)
+    port = free_port()
+    app = start_app(port, supabase_url)
+    base_url = f"http://127.0.0.1:{port}"
+    pages, _ = synthetic_resume(random.Random(1), 2, 0.15)
+    resume_pdf = make_pdf(pages)
+    results = {
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "latency_ms": latency_ms, "jitter_ms": jitter_ms, "iterations": iterations,
+        "users": users, "listings": listings, "bcrypt_rounds": bcrypt_rounds,
+        "levels": [],
+    }
+    try:
+        # One untimed journey so imports and model loading don't count against the first level
+        await run_level(base_url, 1, 1, resume_pdf, 0, timeout)
+        user_offset = 1
+        for concurrency in levels:
+            print(f"  {concurrency} concurrent user(s)...", file=sys.stderr)
+            cpu_before = process_tree_cpu(app.pid)
+            started = time.perf_counter()
+            outcomes = await run_level(base_url, concurrency, iterations, resume_pdf, user_offset % users, timeout)
+            elapsed = time.perf_counter() - started
+            cpu_after = process_tree_cpu(app.pid)
+            cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+            level = summarize_level(concurrency, outcomes, elapsed, cpu)
+            results["levels"].append(level)
+            user_offset += concurrency
+            if (max_p99_ms and level["p99_ms"] and level["p99_ms"] > max_p99_ms) \
+                    or level["error_rate"] > max_error_rate:
+                print(f"  stopping the ramp: latency or errors past the limit at {concurrency} users", file=sys.stderr)
+                break
+    finally:
+        app.terminate()
+        app.wait(timeout=10)
+        stub.shutdown()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ramp concurrent simulated users against the Streamlit app.")
+    parser.add_argument("--levels", type=int, nargs="+", default=DEFAULT_LEVELS, help="concurrent users per step")
+    parser.add_argument("--iterations", type=int, default=2, help="journeys per user at each level")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="added to every stub API request")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=200, help="accounts in the stub")
+    parser.add_argument("--listings", type=int, default=500, help="job listings in the stub")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="cost of the stub users' password hashes")
+    parser.add_argument("--timeout", type=float, default=RERUN_TIMEOUT, help="seconds before a rerun counts as failed")
+    parser.add_argument("--max-p99-ms", type=float, help="stop ramping once p99 rerun latency exceeds this")
+    parser.add_argument("--output", "-o", default="bench_load.json")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_load_test(args.levels, args.iterations, args.latency_ms, args.jitter_ms, args.users,
+                                        args.listings, args.bcrypt_rounds, args.timeout, args.max_p99_ms))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print_levels(results["levels"])
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Per-stage benchmark of the resume analysis pipeline.
+
+Times each stage of the Check page separately over a synthetic corpus
+(benchmarks/synthetic_resumes.py), with warmup rounds and repetitions:
+
+    pdf_reader   Check.pdf_reader, the single-pass pdfminer extraction
+    parse        resume_parsing.parse_resume (the ResumeParser replacement)
+    classify     resume_scoring.classify_field and score_resume
+    keywords     Check.extract_keywords_from_resume
+    recommend    Check.recommend_jobs_from_database against synthetic listings
+
+Each stage gets the previous stages' outputs computed once up front, so only
+the stage itself is timed. Recommendations run against an in-memory SQLite
+database (DATA_BACKEND=sqlite) seeded with --listings synthetic listings.
+Results (p50/p95 latency, throughput, peak RSS) are printed and written as
+JSON; --baseline prints the change against an earlier run's JSON.
+
+    python -m benchmarks.pipeline --count 50 --repeat 3 --output bench_pipeline.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.synthetic_resumes import DEFAULT_COUNT, DEFAULT_SEED, MAX_PAGES, load_corpus, synthetic_listings
+
+STAGES = ["pdf_reader", "parse", "classify", "keywords", "recommend"]
+DEFAULT_CORPUS_DIR = "bench_corpus"
+DEFAULT_LISTINGS = 2000
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def seed_listings(count, seed):
+    """Load synthetic listings into the sqlite repositories recommend_jobs_from_database reads."""
+    from repositories import get_repositories
+
+    job_listings = get_repositories().job_listings
+    for listing in synthetic_listings(count, seed):
+        job_listings.create(listing)
+
+
+def stage_inputs(corpus_dir, manifest):
+    """Read the corpus and precompute what each stage consumes."""
+    from pdf_extract import extract_pdf
+
+    docs = []
+    for entry in manifest["resumes"]:
+        with open(os.path.join(corpus_dir, entry["file"]), "rb") as f:
+            pdf_bytes = f.read()
+        extraction = extract_pdf(pdf_bytes)
+        docs.append({"entry": entry, "pdf_bytes": pdf_bytes, "extraction": extraction, "text": extraction.text})
+    return docs
+
+
+def stage_functions():
+    """Stage name -> function of one prepared document."""
+    import Check
+    from resume_parsing import parse_resume
+    from resume_scoring import classify_field, score_resume
+
+    def classify(doc):
+        # The manifest's planted skills stand in for parsed ones so this stage doesn't need spaCy
+        classify_field(doc["entry"]["skills"], doc["text"])
+        score_resume(doc["text"])
+
+    def recommend(doc):
+        Check.recommend_jobs_from_database(doc["keywords"], doc["text"])
+
+    return {
+        "pdf_reader": lambda doc: Check.pdf_reader(doc["pdf_bytes"]),
+        "parse": lambda doc: parse_resume(doc["extraction"]),
+        "classify": classify,
+        "keywords": lambda doc: Check.extract_keywords_from_resume(doc["text"]),
+        "recommend": recommend,
+    }
+
+
+def time_stage(fn, docs, warmup, repeat):
+    """Run fn over every doc warmup + repeat times; return per-call latencies of the timed rounds."""
+    for _ in range(warmup):
+        for doc in docs:
+            fn(doc)
+    samples = []
+    for _ in range(repeat):
+        for doc in docs:
+            started = time.perf_counter()
+            fn(doc)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(samples):
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "mean_ms": round(total / len(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "docs_per_s": round(len(samples) / total, 2) if total > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmark(corpus_dir=DEFAULT_CORPUS_DIR, count=DEFAULT_COUNT, seed=DEFAULT_SEED, max_pages=MAX_PAGES,
+                  stages=STAGES, warmup=1, repeat=3, listings=DEFAULT_LISTINGS):
+    """Benchmark the selected stages and return the results document."""
+    manifest = load_corpus(corpus_dir, count, seed, max_pages)
+    docs = stage_inputs(corpus_dir, manifest)
+    functions = stage_functions()
+    if "recommend" in stages:
+        import Check
+
+        seed_listings(listings, seed)
+        for doc in docs:
+            doc["keywords"] = Check.extract_keywords_from_resume(doc["text"])
+
+    results = {
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "dir": corpus_dir, "seed": seed, "count": len(docs), "max_pages": max_pages,
+            "pages": sum(doc["extraction"].page_count for doc in docs),
+            "bytes": sum(len(doc["pdf_bytes"]) for doc in docs),
+        },
+        "warmup": warmup,
+        "repeat": repeat,
+        "listings": listings if "recommend" in stages else 0,
+        "stages": {},
+    }
+    for stage in stages:
+        print(f"  {stage}...", file=sys.stderr)
+        try:
+            results["stages"][stage] = summarize(time_stage(functions[stage], docs, warmup, repeat))
+        except Exception as e:
+            # e.g. the spaCy model isn't installed; the other stages still run
+            results["stages"][stage] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+def print_results(results, baseline=None):
+    print(f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'docs/s':>10}{'RSS MB':>10}")
+    for stage, stats in results["stages"].items():
+        if "error" in stats:
+            print(f"{stage:<12}  skipped: {stats['error']}")
+            continue
+        line = f"{stage:<12}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['docs_per_s']:>10}{stats['peak_rss_mb']:>10}"
+        before = (baseline or {}).get("stages", {}).get(stage, {})
+        if before.get("p50_ms"):
+            line += f"   p50 {(stats['p50_ms'] / before['p50_ms'] - 1) * 100:+.1f}% vs baseline"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each stage of the resume analysis pipeline.")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR, help="generated here if missing")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="resumes in the corpus")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--warmup", type=int, default=1, help="untimed rounds over the corpus per stage")
+    parser.add_argument("--repeat", type=int, default=3, help="timed rounds over the corpus per stage")
+    parser.add_argument("--listings", type=int, default=DEFAULT_LISTINGS, help="synthetic listings to recommend from")
+    parser.add_argument("--output", "-o", default="bench_pipeline.json")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    # Recommendations read from a throwaway embedded database, never the real backend
+    os.environ["DATA_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = ":memory:"
+
+    results = run_benchmark(args.corpus_dir, args.count, args.seed, args.max_pages, args.stages,
+                            args.warmup, args.repeat, args.listings)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Local stand-in for the Supabase REST API, for load tests.
+
+Serves the PostgREST requests the app makes (table reads with eq/neq/gt/
+gte/lt/lte/in/is filters and or/and trees, order, limit, offset and exact
+counts; inserts; updates; deletes; and the submit_application /
+get_applied_jobs functions) from in-memory tables, adding a configurable
+latency to every request so the app sees a realistic round trip. Any other
+filter is answered with 400 rather than with unfiltered rows. Point the app at it with SUPABASE_URL and any JWT-shaped
+SUPABASE_KEY.
+
+    python -m benchmarks.postgrest_stub --port 54321 --latency-ms 40 --users 200
+"""
+import argparse
+import datetime
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks.synthetic_resumes import DEFAULT_SEED, synthetic_listings
+
+# Accepted by supabase-py's key check; the stub never verifies it
+STUB_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.c3R1Yg"
+LOAD_TEST_PASSWORD = "load-test-password"
+# Database functions the app calls through rpc()
+RPC_FUNCTIONS = ("submit_application", "get_applied_jobs")
+
+
+def load_test_user(i):
+    return f"loaduser{i}@example.com"
+
+
+def _coerce(value):
+    value = value.strip('"')
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if value.lower() in ("true", "false"):   # Postgres reads booleans case-insensitively
+        return value.lower() == "true"
+    return None if value == "null" else value
+
+
+def _sort_key(value):
+    return (value is None, value if value is not None else 0)
+
+
+class UnsupportedQuery(ValueError):
+    """A filter the stub does not implement; answered with 400 rather than with the wrong rows."""
+
+
+def _split_top_level(text):
+    """Split a PostgREST logic tree body on the commas outside quotes and parentheses."""
+    parts, current, depth, quoted = [], [], 0, False
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and not depth and ch == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    return parts
+
+
+def _compare(op, value, operand):
+    if op == "eq":
+        return value == _coerce(operand)
+    if op == "neq":
+        return value != _coerce(operand)
+    if op in ("gt", "lt", "gte", "lte"):
+        other = _coerce(operand)
+        if value is None or other is None:
+            return False
+        return {"gt": value > other, "lt": value < other, "gte": value >= other, "lte": value <= other}[op]
+    if op == "in":
+        return value in [_coerce(v) for v in _split_top_level(operand.strip("()"))]
+    if op == "is":
+        return value is _coerce(operand)
+    raise UnsupportedQuery(f"unsupported filter operator {op!r}")
+
+
+def _condition(column, filter_text):
+    """Predicate for one 'op.operand' filter on a column."""
+    op, dot, operand = filter_text.partition(".")
+    if not dot:
+        raise UnsupportedQuery(f"malformed filter {column}={filter_text}")
+    _compare(op, None, operand)   # reject unknown operators up front
+    return lambda row: _compare(op, row.get(column), operand)
+
+
+def _logic(kind, body):
+    """Predicate for an and(...) / or(...) tree, e.g. or=(a.lt.1,and(a.eq.1,id.lt.5))."""
+    predicates = [_logic_item(item) for item in _split_top_level(body)]
+    combine = all if kind == "and" else any
+    return lambda row: combine(predicate(row) for predicate in predicates)
+
+
+def _logic_item(item):
+    for kind in ("and", "or"):
+        if item.startswith(kind + "(") and item.endswith(")"):
+            return _logic(kind, item[len(kind) + 1:-1])
+    column, dot, filter_text = item.partition(".")
+    if not dot:
+        raise UnsupportedQuery(f"malformed filter {item!r}")
+    return _condition(column, filter_text)
+
+
+class StubDatabase:
+    """In-memory tables with autoincrementing ids."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tables = {name: [] for name in ("users", "job_listings", "job_applications", "feedback", "user_data")}
+        self._ids = dict.fromkeys(self.tables, 0)
+
+    def insert(self, table, row):
+        with self.lock:
+            return self._insert_locked(table, row)
+
+    def _insert_locked(self, table, row):
+        self._ids[table] += 1
+        row = {"id": self._ids[table], "created_at": datetime.datetime.now().isoformat(), **row}
+        self.tables[table].append(row)
+        return dict(row)
+
+    def seed(self, users=200, listings=500, seed=DEFAULT_SEED, bcrypt_rounds=12):
+        """Load-test users (all with LOAD_TEST_PASSWORD) and synthetic job listings."""
+        import bcrypt
+
+        # One hash for everyone: checking it costs the app the same as a real user's
+        hashed = bcrypt.hashpw(LOAD_TEST_PASSWORD.encode("utf-8"), bcrypt.gensalt(bcrypt_rounds)).decode("utf-8")
+        for i in range(users):
+            self.insert("users", {
+                "email": load_test_user(i), "username": f"loaduser{i}", "full_name": f"Load User {i}",
+                "password": hashed, "user_type": "user",
+            })
+        rng = random.Random(seed)
+        for listing in synthetic_listings(listings, seed):
+            self.insert("job_listings", {**listing, "is_active": True, "job_frequency": rng.choice(["Weekly", "Daily"])})
+
+    def select(self, table, params):
+        """
+        Rows matching PostgREST query parameters, ordered and limited, and how
+        many rows matched before offset and limit.
+        """
+        rows = self.tables[table]
+        limit = order = None
+        offset = 0
+        predicates = []
+        for key, value in params:
+            if key == "limit":
+                limit = int(value)
+            elif key == "offset":
+                offset = int(value)
+            elif key == "order":
+                order = value
+            elif key == "select":
+                continue
+            elif key in ("or", "and"):
+                if not (value.startswith("(") and value.endswith(")")):
+                    raise UnsupportedQuery(f"malformed {key} filter {value!r}")
+                predicates.append(_logic(key, value[1:-1]))
+            else:
+                predicates.append(_condition(key, value))
+
+        with self.lock:
+            found = [dict(row) for row in rows if all(predicate(row) for predicate in predicates)]
+        for part in reversed((order or "").split(",")):
+            if part:
+                column, _, direction = part.partition(".")
+                found.sort(key=lambda row: _sort_key(row.get(column)), reverse=direction.startswith("desc"))
+        page = found[offset:offset + limit] if limit is not None else found[offset:]
+        return page, len(found)
+
+    def submit_application(self, args):
+        # Look up and insert in one critical section, as the unique key does in Postgres
+        with self.lock:
+            job = next((job for job in self.tables["job_listings"] if job["id"] == args["p_job_id"]), None)
+            if job is None:
+                return []
+            existing = next((a for a in self.tables["job_applications"]
+                             if a["user_id"] == args["p_user_id"] and a["job_id"] == args["p_job_id"]), None)
+            created = existing is None
+            if created:
+                existing = self._insert_locked("job_applications", {
+                    "user_id": args["p_user_id"], "job_id": args["p_job_id"],
+                    "resume_path": args["p_resume_path"], "teaching_style": args["p_teaching_style"],
+                    "availability": args["p_availability"], "is_confirmed": False, "status": "Pending",
+                })
+        return [{key: existing[key] for key in ("id", "user_id", "job_id", "status", "created_at")}
+                | {"city": job["city"], "state": job["state"], "created": created}]
+
+    def get_applied_jobs(self, args):
+        with self.lock:
+            jobs = {job["id"]: job for job in self.tables["job_listings"]}
+            applications = [a for a in self.tables["job_applications"] if a["user_id"] == args["user_id_param"]]
+        return [{
+            "job_title": jobs[a["job_id"]]["job_title"], "job_subject": jobs[a["job_id"]]["job_subject"],
+            "city": jobs[a["job_id"]]["city"], "state": jobs[a["job_id"]]["state"],
+            "job_frequency": jobs[a["job_id"]].get("job_frequency"), "status": a["status"],
+        } for a in applications if a["job_id"] in jobs]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API behind the pooled client
+    database = None
+    latency = 0.0
+    jitter = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _wait(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _reply(self, status, payload=None, headers=()):
+        body = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _route(self):
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts[:2] != ["rest", "v1"] or len(parts) < 3:
+            return None, None, []
+        if parts[2] == "rpc":
+            return "rpc", parts[3], []
+        return "table", parts[2], parse_qsl(url.query, keep_blank_values=True)
+
+    def _select(self, name, params):
+        """(matching rows, total), or (None, 0) after answering 400 for a filter the stub cannot evaluate."""
+        try:
+            return self.database.select(name, params)
+        except (UnsupportedQuery, ValueError) as e:
+            self._reply(400, {"message": str(e)})
+            return None, 0
+
+    def _read(self):
+        self._wait()
+        self._body()   # postgrest-py sends "{}" with reads; drain it so the connection stays usable
+        kind, name, params = self._route()
+        if kind != "table" or name not in self.database.tables:
+            return self._reply(404, {"message": f"unknown path {self.path}"})
+        rows, total = self._select(name, params)
+        if rows is None:
+            return
+        headers = []
+        if "count=exact" in (self.headers.get("Prefer") or ""):
+            offset = int(dict(params).get("offset", 0))
+            shown = f"{offset}-{offset + len(rows) - 1}" if rows else "*"
+            headers.append(("Content-Range", f"{shown}/{total}"))
+        self._reply(200, rows, headers)
+
+    do_GET = _read
+    do_HEAD = _read
+
+    def do_POST(self):
+        self._wait()
+        kind, name, _ = self._route()
+        body = self._body()
+        if kind == "rpc" and name in RPC_FUNCTIONS:
+            return self._reply(200, getattr(self.database, name)(body or {}))
+        if kind == "table" and name in self.database.tables:
+            rows = body if isinstance(body, list) else [body]
+            return self._reply(201, [self.database.insert(name, row) for row in rows])
+        self._reply(404, {"message": f"unknown path {self.path}"})
+
+    def do_PATCH(self):
+        self._wait()
+        kind, name, params = self._route()
+        changes = self._body() or {}
+        if kind != "table" or name not in self.database.tables:
+            return self._reply(404, {"message": f"unknown path {self.path}"})
+        rows, _ = self._select(name, params)
+        if rows is None:
+            return
+        matched = {row["id"] for row in rows}
+        with self.database.lock:
+            updated = [row.update(changes) or dict(row) for row in self.database.tables[name] if row["id"] in matched]
+        self._reply(200, updated)
+
+    def do_DELETE(self):
+        self._wait()
+        kind, name, params = self._route()
+        if kind != "table" or name not in self.database.tables:
+            return self._reply(404, {"message": f"unknown path {self.path}"})
+        rows, _ = self._select(name, params)
+        if rows is None:
+            return
+        matched = {row["id"] for row in rows}
+        with self.database.lock:
+            self.database.tables[name] = [row for row in self.database.tables[name] if row["id"] not in matched]
+        self._reply(200, [])
+
+
+def start_stub(port=0, latency_ms=0.0, jitter_ms=0.0, users=200, listings=500, seed=DEFAULT_SEED, bcrypt_rounds=12):
+    """Start the stub on a background thread; return (server, base URL)."""
+    database = StubDatabase()
+    database.seed(users, listings, seed, bcrypt_rounds)
+    handler = type("Handler", (StubHandler,), {
+        "database": database, "latency": latency_ms / 1000, "jitter": jitter_ms / 1000,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve an in-memory stand-in for the Supabase REST API.")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- variation of the latency")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--listings", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    server, url = start_stub(args.port, args.latency_ms, args.jitter_ms, args.users, args.listings, args.seed)
+    print(f"Serving on {url} (SUPABASE_KEY={STUB_KEY}); users log in as "
+          f"{load_test_user(0)} / {LOAD_TEST_PASSWORD}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
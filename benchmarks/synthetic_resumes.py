@@ -0,0 +1,173 @@
+"""
+Reproducible synthetic resumes and job listings for benchmarks.
+
+The same seed always produces byte-identical PDFs, so timings from different
+runs (or branches) are measured on the same input. Each resume has 1-10 pages
+of text-only content with a configurable share of lines naming skills from
+keywords.TAXONOMIES; a manifest.json next to the PDFs records the page count
+and the skills planted in each one.
+
+    python -m benchmarks.synthetic_resumes bench_corpus --count 50 --seed 7
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+from keywords import TAXONOMIES
+
+DEFAULT_SEED = 7
+DEFAULT_COUNT = 50
+MAX_PAGES = 10
+LINES_PER_PAGE = 45
+SKILL_DENSITIES = (0.05, 0.15, 0.3)   # share of body lines that mention a skill
+
+SECTIONS = ["Objective", "Education", "Experience", "Projects", "Achievements", "Hobbies", "Declaration"]
+FIRST_NAMES = ["Aisyah", "Daniel", "Mei Ling", "Arjun", "Nurul", "Wei Jie", "Farah", "Kumar", "Siti", "Jason"]
+LAST_NAMES = ["Abdullah", "Tan", "Rajan", "Lim", "Ismail", "Wong", "Hassan", "Chong", "Yusof", "Lee"]
+CITIES = [("Kuala Lumpur", "Wilayah Persekutuan"), ("Shah Alam", "Selangor"), ("Johor Bahru", "Johor"),
+          ("George Town", "Penang"), ("Kota Kinabalu", "Sabah"), ("Ipoh", "Perak")]
+FILLER = [
+    "Planned and delivered weekly lessons for mixed-ability classes.",
+    "Worked with parents to set learning goals and track progress.",
+    "Prepared students for school examinations and assessments.",
+    "Organised after-school activities and study groups.",
+    "Adapted teaching materials for different learning styles.",
+    "Kept attendance, marks and progress reports up to date.",
+    "Mentored new tutors and reviewed their lesson plans.",
+    "Used online tools to run remote tutoring sessions.",
+]
+
+ALL_SKILLS = sorted({skill for terms in TAXONOMIES.values() for skill in terms})
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages_lines):
+    """Write a minimal text-only PDF (Helvetica, one content stream per page)."""
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", None]
+    font_id, pages_id = 1, 2
+    kids = []
+    for lines in pages_lines:
+        stream = ("BT /F1 10 Tf 54 750 Td 15 TL "
+                  + " ".join(f"({_escape(line)}) Tj T*" for line in lines) + " ET").encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                       % (pages_id, font_id, content_id))
+        kids.append(len(objects))
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode(), len(kids))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    catalog_id = len(objects)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_at)
+    return bytes(out)
+
+
+def synthetic_resume(rng, page_count, skill_density):
+    """Return (pages as lists of lines, metadata) for one resume."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    city, state = rng.choice(CITIES)
+    skills = set()
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com",
+        f"+60 1{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}",
+        f"{city}, {state}",
+    ]
+    sections = rng.sample(SECTIONS, rng.randint(2, len(SECTIONS)))
+    body_lines = page_count * LINES_PER_PAGE - len(lines)
+    for i in range(body_lines):
+        if i % (body_lines // len(sections) or 1) == 0 and sections:
+            lines.append(sections.pop(0))
+        elif rng.random() < skill_density:
+            skill = rng.choice(ALL_SKILLS)
+            skills.add(skill)
+            lines.append(f"Skills: {skill}, {rng.choice(FILLER).lower()}")
+        else:
+            lines.append(rng.choice(FILLER))
+    pages = [lines[start:start + LINES_PER_PAGE] for start in range(0, len(lines), LINES_PER_PAGE)]
+    return pages, {"name": name, "pages": len(pages), "skill_density": skill_density, "skills": sorted(skills)}
+
+
+def generate_corpus(out_dir, count=DEFAULT_COUNT, seed=DEFAULT_SEED, max_pages=MAX_PAGES, densities=SKILL_DENSITIES):
+    """
+    Write count resumes (page counts cycling 1..max_pages, densities cycling
+    through densities) and their manifest; return the manifest.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"seed": seed, "count": count, "max_pages": max_pages, "resumes": []}
+    for i in range(count):
+        pages, meta = synthetic_resume(rng, i % max_pages + 1, densities[i % len(densities)])
+        filename = f"resume_{i:04d}.pdf"
+        with open(os.path.join(out_dir, filename), "wb") as f:
+            f.write(make_pdf(pages))
+        manifest["resumes"].append({"file": filename, **meta})
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_corpus(out_dir, count=DEFAULT_COUNT, seed=DEFAULT_SEED, max_pages=MAX_PAGES):
+    """Return the manifest in out_dir, generating the corpus first if it is missing or was made differently."""
+    path = os.path.join(out_dir, "manifest.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if (manifest["seed"], manifest["count"], manifest["max_pages"]) == (seed, count, max_pages):
+            return manifest
+    return generate_corpus(out_dir, count, seed, max_pages)
+
+
+def synthetic_listings(count, seed=DEFAULT_SEED):
+    """Job listings shaped like the upload form's, each asking for a few taxonomy skills."""
+    rng = random.Random(seed)
+    subjects = [taxonomy for taxonomy in TAXONOMIES if taxonomy != "recommendation"]
+    listings = []
+    for i in range(count):
+        subject = rng.choice(subjects)
+        city, state = rng.choice(CITIES)
+        skills = rng.sample(TAXONOMIES[subject], min(3, len(TAXONOMIES[subject])))
+        listings.append({
+            "parent_email": f"parent{i % 200}@example.com",
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "city": city,
+            "state": state,
+            "job_title": f"{subject.replace('_', ' ').title()} tutor #{i}",
+            "job_subject": subject.replace("_", " "),
+            "job_description": " ".join(rng.sample(FILLER, 3)),
+            "required_skills": ", ".join(skills),
+            "hourly_rate": rng.choice([30, 40, 50, 60, 80]),
+        })
+    return listings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic resume corpus.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(args.out_dir, args.count, args.seed, args.max_pages)
+    print(f"Wrote {len(manifest['resumes'])} resumes to {args.out_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Bytes copied per upload on the Check page.
+
+Feeds each resume of the synthetic corpus through the page's upload path
+as a real Streamlit UploadedFile and measures, with tracemalloc, how many
+bytes each step allocates in Python memory:
+
+    receive   getting at the uploaded bytes
+    store     writing them to the resume store
+    preview   the base64 data URI for the preview (1.33x is the encoding itself)
+    hash      the parse cache key
+    handoff   pickling the analysis job for the worker pool and unpickling it there
+    extract   opening the PDF for pdfminer in the worker
+
+Two pipelines are measured on the same files: "buffer", the current one
+(a single view of the bytes Streamlit holds; the worker maps the stored
+file), and "reread", the earlier one (getbuffer(), write to disk, read the
+file back for the preview, send the bytes to the worker). Totals are also
+given as multiples of the upload size. Fixed costs (the store's index
+query, pickler buffers) add a few KB per step whatever the upload size.
+
+    python -m benchmarks.upload_copies --count 20 --output bench_upload_copies.json
+"""
+import argparse
+import base64
+import datetime
+import json
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic_resumes import DEFAULT_COUNT, DEFAULT_SEED, MAX_PAGES, load_corpus
+
+PIPELINES = ["buffer", "reread"]
+STEPS = ["receive", "store", "preview", "hash", "handoff", "extract"]
+DEFAULT_CORPUS_DIR = "bench_corpus"
+
+
+def uploaded_file(pdf_bytes, name="resume.pdf"):
+    """The object st.file_uploader hands the page for these bytes."""
+    from streamlit.proto.Common_pb2 import FileURLs
+    from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+
+    return UploadedFile(UploadedFileRec("bench", name, "application/pdf", pdf_bytes), FileURLs())
+
+
+def allocated(fn):
+    """Run fn; return (its result, peak bytes it allocated beyond what was live before)."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    return result, tracemalloc.get_traced_memory()[1] - before
+
+
+def buffer_pipeline(upload, store):
+    """The current Check.run path."""
+    from analysis_pool import analysis_job
+    from parse_cache import resume_cache_key
+    from pdf_extract import _open_source
+
+    copied = {}
+    view, copied["receive"] = allocated(lambda: memoryview(upload.getvalue()))
+    ref, copied["store"] = allocated(lambda: store.put(view))
+    _, copied["preview"] = allocated(lambda: base64.b64encode(view))
+    _, copied["hash"] = allocated(lambda: resume_cache_key(view))
+    local_path = store.local_path(ref)
+    payload, copied["handoff"] = allocated(lambda: pickle.dumps(analysis_job(view, local_path)))
+    (_, path), loaded = allocated(lambda: pickle.loads(payload))
+    copied["handoff"] += loaded
+
+    def open_mapped():
+        with open(path, "rb", buffering=0) as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            _open_source(mapped)
+    _, copied["extract"] = allocated(open_mapped)
+    return copied
+
+
+def reread_pipeline(upload, directory):
+    """The path Check.run took before: write the upload to disk and read it back."""
+    from analysis_pool import analyze_pdf_bytes
+    from parse_cache import resume_cache_key
+    from pdf_extract import _open_source
+
+    copied = {}
+    path = os.path.join(directory, upload.name)
+    buffer, copied["receive"] = allocated(upload.getbuffer)
+
+    def write():
+        with open(path, "wb") as f:
+            f.write(buffer)
+    _, copied["store"] = allocated(write)
+
+    def preview():
+        with open(path, "rb") as f:
+            return base64.b64encode(f.read())
+    _, copied["preview"] = allocated(preview)
+    pdf_bytes, receive_value = allocated(upload.getvalue)
+    copied["receive"] += receive_value
+    _, copied["hash"] = allocated(lambda: resume_cache_key(pdf_bytes))
+    payload, copied["handoff"] = allocated(lambda: pickle.dumps((analyze_pdf_bytes, bytes(pdf_bytes))))
+    (_, worker_bytes), loaded = allocated(lambda: pickle.loads(payload))
+    copied["handoff"] += loaded
+    _, copied["extract"] = allocated(lambda: _open_source(worker_bytes))
+    buffer.release()
+    return copied
+
+
+def run_benchmark(corpus_dir=DEFAULT_CORPUS_DIR, count=DEFAULT_COUNT, seed=DEFAULT_SEED, max_pages=MAX_PAGES):
+    """Measure both pipelines over the corpus and return the results document."""
+    from resume_store import LocalResumeStore
+
+    manifest = load_corpus(corpus_dir, count, seed, max_pages)
+    totals = {pipeline: dict.fromkeys(STEPS, 0) for pipeline in PIPELINES}
+    upload_bytes = 0
+    tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            store = LocalResumeStore(root=os.path.join(directory, "store"), compression="none")
+            for i, entry in enumerate(manifest["resumes"]):
+                with open(os.path.join(corpus_dir, entry["file"]), "rb") as f:
+                    pdf_bytes = f.read()
+                upload_bytes += len(pdf_bytes)
+                # A fresh upload object per pipeline, as every upload gets its own
+                for step, value in buffer_pipeline(uploaded_file(pdf_bytes), store).items():
+                    totals["buffer"][step] += value
+                reread_dir = os.path.join(directory, f"reread{i}")
+                os.makedirs(reread_dir)
+                for step, value in reread_pipeline(uploaded_file(pdf_bytes), reread_dir).items():
+                    totals["reread"][step] += value
+    finally:
+        tracemalloc.stop()
+
+    uploads = len(manifest["resumes"])
+    results = {
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "corpus": {"dir": corpus_dir, "seed": seed, "count": uploads, "bytes": upload_bytes},
+        "pipelines": {},
+    }
+    for pipeline, steps in totals.items():
+        per_upload = {step: round(value / uploads) for step, value in steps.items()}
+        total = sum(steps.values())
+        results["pipelines"][pipeline] = {
+            "bytes_per_upload": per_upload,
+            "total_bytes_per_upload": round(total / uploads),
+            "copies_per_upload": round(total / upload_bytes, 2),
+        }
+    return results
+
+
+def print_results(results):
+    print(f"{'pipeline':<10}" + "".join(f"{step:>10}" for step in STEPS) + f"{'total':>10}{'copies':>8}")
+    for pipeline, stats in results["pipelines"].items():
+        print(f"{pipeline:<10}" + "".join(f"{stats['bytes_per_upload'][step]:>10}" for step in STEPS)
+              + f"{stats['total_bytes_per_upload']:>10}{stats['copies_per_upload']:>8}")
+    print(f"(bytes per upload; average upload {results['corpus']['bytes'] // results['corpus']['count']} bytes)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the bytes copied per resume upload.")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR, help="generated here if missing")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="resumes in the corpus")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--output", "-o", default="bench_upload_copies.json")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.corpus_dir, args.count, args.seed, args.max_pages)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print_results(results)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
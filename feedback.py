@@ -1,12 +1,9 @@
 import streamlit as st
-from supabase import create_client
+from repositories import get_repositories
 from datetime import datetime
-
-def create_supabase_client():
-    # Replace with your Supabase URL and API Key
-    SUPABASE_URL = "https://your-supabase-url.supabase.co"
-    SUPABASE_KEY = "your-supabase-key"
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+from pagination import paginated_list, keyset_cursor, reset_pagination
+from feedback_stats import get_rating_aggregate
+from query_cache import get_query_cache
 
 def star_rating_widget(label, max_stars=5, default_rating=3):
     """
@@ -37,7 +34,7 @@ def render_stars(rating):
     stars = full_star * rating + empty_star * (5 - rating)
     return f"<span style='color: gold; font-size: 20px;'>{stars}</span>"
 
-def submit_feedback(supabase, full_name, user_email, rating, comment):
+def submit_feedback(repository, full_name, user_email, rating, comment):
     """
     Submit feedback to the database
     """
@@ -49,29 +46,55 @@ def submit_feedback(supabase, full_name, user_email, rating, comment):
             "comment": comment,
             "created_at": datetime.now().isoformat()
         }
-        response = supabase.table("feedback").insert(data).execute()
-        return response.status_code == 201
+        created = repository.create(data)
+        if created:
+            get_rating_aggregate().record(rating)
+            get_query_cache().invalidate("feedback")
+        return bool(created)
     except Exception as e:
         st.error(f"Error submitting feedback: {e}")
         return False
 
-def fetch_feedbacks(supabase):
+def fetch_feedbacks(repository, before=None, limit=10):
     """
-    Fetch all feedbacks from the database
+    Fetch one page of feedbacks, newest first, that come after the (created_at, id)
+    cursor of the previous page
     """
     try:
-        response = supabase.table("feedback").select("*").order("created_at", desc=True).execute()
-        return response.data if response.status_code == 200 else []
+        # Star clicks rerun the page; they are served from the cache until new feedback arrives
+        return get_query_cache().get_or_load(
+            "feedback", "page", {"before": before, "limit": limit},
+            lambda: repository.page(before, limit),
+        ) or []
     except Exception as e:
         st.error(f"Error fetching feedbacks: {e}")
         return []
 
+def render_feedback(feedback):
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(f"<h3 style='margin:0;'>👤 {feedback['full_name']}</h3>", unsafe_allow_html=True)
+    with col2:
+        st.markdown(render_stars(feedback['rating']), unsafe_allow_html=True)
+    st.markdown(f"<div>{feedback['comment']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div style='color: #666;'>🕒 {feedback['created_at']}</div>", unsafe_allow_html=True)
+    st.markdown("---")
+
+def render_rating_summary(summary):
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.metric("Average Rating", f"{summary['mean']:.1f} ★")
+        st.caption(f"from {summary['count']} review(s)")
+    with col2:
+        for rating in range(5, 0, -1):
+            share = summary['histogram'][rating] / summary['count'] if summary['count'] else 0.0
+            st.progress(share, text=f"{rating} ★  ({summary['histogram'][rating]})")
+
 def feedback():
     st.markdown("<h1 style='text-align: center; color: #0066cc;'>Feedback Portal</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center; color: #666;'>We value your thoughts and experiences</p>", unsafe_allow_html=True)
 
-    # Create Supabase client
-    supabase = create_supabase_client()
+    repository = get_repositories().feedback
 
     # Feedback Submission Section
     if st.session_state.get("logged_in", False):
@@ -88,27 +111,32 @@ def feedback():
 
         if st.button("Submit Feedback"):
             if rating > 0:
-                if submit_feedback(supabase, full_name, user_email, rating, comment):
+                if submit_feedback(repository, full_name, user_email, rating, comment):
                     st.success("🎉 Thank you for your valuable feedback!")
+                    reset_pagination("feedbacks")
             else:
                 st.warning("⚠️ Please select a rating.")
     else:
         st.info("👋 Please log in to share your experience!")
 
-    # Fetch and display feedbacks
-    feedbacks = fetch_feedbacks(supabase)
+    # Summary from the maintained aggregate instead of scanning every rating
     st.markdown("---")
-    if feedbacks:
-        for feedback in feedbacks:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"<h3 style='margin:0;'>👤 {feedback['full_name']}</h3>", unsafe_allow_html=True)
-            with col2:
-                st.markdown(render_stars(feedback['rating']), unsafe_allow_html=True)
-            st.markdown(f"<div>{feedback['comment']}</div>", unsafe_allow_html=True)
-            st.markdown(f"<div style='color: #666;'>🕒 {feedback['created_at']}</div>", unsafe_allow_html=True)
-            st.markdown("---")
-    else:
+    rating_aggregate = get_rating_aggregate()
+    try:
+        rating_aggregate.refresh(repository)
+    except Exception as e:
+        st.error(f"Error fetching rating summary: {e}")
+    render_rating_summary(rating_aggregate.summary())
+
+    # Fetch and display one page of feedbacks at a time, keyset-paginated on (created_at, id)
+    st.markdown("---")
+    feedbacks = paginated_list(
+        "feedbacks",
+        lambda before, limit: fetch_feedbacks(repository, before, limit),
+        render_feedback,
+        next_cursor=keyset_cursor("created_at", "id"),
+    )
+    if not feedbacks:
         st.info("📝 No feedbacks yet. Be the first to share your experience!")
 
 if __name__ == "__main__":
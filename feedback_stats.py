@@ -0,0 +1,62 @@
+import threading
+import time
+
+RATINGS = (1, 2, 3, 4, 5)
+RESEED_INTERVAL = 10 * 60   # seconds between recounts, to pick up feedback written by other processes
+
+
+class RatingAggregate:
+    """
+    Running count, mean and 1-5 histogram of feedback ratings.
+
+    Seeded with a count per rating value from the database, then kept up to
+    date by record() as feedback is submitted, so showing the summary never
+    scans the feedback table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histogram = dict.fromkeys(RATINGS, 0)
+        self._seeded_at = 0.0
+
+    def seed(self, feedback):
+        """Recount every rating value through the feedback repository."""
+        counts = feedback.rating_counts()
+        histogram = {rating: counts.get(rating, 0) for rating in RATINGS}
+        with self._lock:
+            self.histogram = histogram
+            self._seeded_at = time.time()
+
+    def refresh(self, feedback, force=False):
+        """Seed on first use, and recount once the numbers are RESEED_INTERVAL old."""
+        if force or not self._seeded_at or time.time() - self._seeded_at > RESEED_INTERVAL:
+            self.seed(feedback)
+
+    def record(self, rating):
+        """Count one newly inserted rating."""
+        with self._lock:
+            if rating in self.histogram:
+                self.histogram[rating] += 1
+
+    def summary(self):
+        with self._lock:
+            count = sum(self.histogram.values())
+            total = sum(rating * n for rating, n in self.histogram.items())
+            return {
+                "count": count,
+                "mean": total / count if count else 0.0,
+                "histogram": dict(self.histogram),
+            }
+
+
+_aggregate = None
+_aggregate_lock = threading.Lock()
+
+
+def get_rating_aggregate():
+    """Return the process-wide rating aggregate (empty until refreshed)."""
+    global _aggregate
+    with _aggregate_lock:
+        if _aggregate is None:
+            _aggregate = RatingAggregate()
+        return _aggregate
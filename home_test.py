@@ -14,6 +14,7 @@ def connect_db():
         st.error(f"Database connection error: {e}")
         return None
 
+@st.cache_data(show_spinner=False)
 def get_base64_image(image_path):
     with open(image_path, "rb") as image_file:
         encoded = base64.b64encode(image_file.read()).decode()
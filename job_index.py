@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import defaultdict
+
+from job_ranking import JobRanker
+from search_index import TrigramIndex
+
+# Fields whose comma-separated entries become index terms
+INDEXED_FIELDS = ("job_subject", "required_skills")
+
+REFRESH_INTERVAL = 30        # seconds between incremental refreshes (new rows only)
+REBUILD_INTERVAL = 15 * 60   # seconds between full rebuilds (catches edits/deletes made elsewhere)
+
+
+def normalize_terms(value):
+    """Split a comma-separated field into lowercase, stripped terms."""
+    return {term.strip().lower() for term in (value or '').split(',') if term.strip()}
+
+
+class JobIndex:
+    """In-process inverted index from normalised subject/skill term to job listing IDs."""
+
+    def __init__(self):
+        self.jobs = {}
+        self._postings = defaultdict(set)
+        self._job_terms = {}
+        self.ranker = JobRanker()
+        self.search_index = TrigramIndex()
+        self._lock = threading.RLock()
+        self._loaded_id = None   # highest ID read from the repository; local upserts don't move it
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def _job_term_set(self, job):
+        terms = set()
+        for field in INDEXED_FIELDS:
+            terms |= normalize_terms(job.get(field))
+        return terms
+
+    def upsert(self, job):
+        """Add a listing, or re-index it if it is already present."""
+        with self._lock:
+            job_id = job['id']
+            self._unlink(job_id)
+            terms = self._job_term_set(job)
+            self.jobs[job_id] = job
+            self._job_terms[job_id] = terms
+            for term in terms:
+                self._postings[term].add(job_id)
+            self.ranker.upsert(job)
+            self.search_index.upsert(job)
+
+    def _unlink(self, job_id):
+        for term in self._job_terms.pop(job_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self._postings[term]
+
+    def remove(self, job_id):
+        """Drop a listing from the index."""
+        with self._lock:
+            self._unlink(job_id)
+            self.jobs.pop(job_id, None)
+            self.ranker.remove(job_id)
+            self.search_index.remove(job_id)
+
+    def invalidate(self):
+        """Make the next refresh a full rebuild."""
+        with self._lock:
+            self._rebuilt_at = 0.0
+
+    def build(self, jobs):
+        """Replace the whole index with the given listings."""
+        with self._lock:
+            self.jobs.clear()
+            self._postings.clear()
+            self._job_terms.clear()
+            self.ranker.build([])
+            self.search_index.build([])
+            for job in jobs:
+                self.upsert(job)
+
+    def _ordered(self, job_ids):
+        return [self.jobs[job_id] for job_id in sorted(job_ids, key=lambda i: (not isinstance(i, int), i))]
+
+    def match_ids(self, keywords):
+        """Return the IDs of listings whose subject or skills contain any of the keywords."""
+        terms = {keyword.strip().lower() for keyword in keywords}
+        with self._lock:
+            matched = set()
+            for term in terms:
+                matched |= self._postings.get(term, set())
+            return matched
+
+    def match_any(self, keywords):
+        """Return listings whose subject or skills contain any of the keywords."""
+        with self._lock:
+            return self._ordered(self.match_ids(keywords))
+
+    def match_all(self, keywords):
+        """Return listings whose subject or skills contain every one of the keywords."""
+        terms = {keyword.strip().lower() for keyword in keywords}
+        if not terms:
+            return []
+        with self._lock:
+            postings = sorted((self._postings.get(term, set()) for term in terms), key=len)
+            return self._ordered(set.intersection(*postings))
+
+    def rank(self, keywords, query_text, top_k=20):
+        """
+        Return up to top_k listings matching any keyword, ordered by BM25
+        relevance to the query text, each with a 'score' field added.
+        """
+        with self._lock:
+            candidate_ids = self.match_ids(keywords)
+            ranked = self.ranker.rank(query_text, top_k=top_k, candidate_ids=candidate_ids)
+            return [{**self.jobs[job_id], 'score': round(score, 3)} for job_id, score in ranked]
+
+    def search(self, query, fields=None, limit=50):
+        """
+        Typo-tolerant search over title, subject, city and state (or just the
+        given fields), most relevant first, each listing with a 'score' field added.
+        """
+        with self._lock:
+            ranked = self.search_index.search(query, fields=fields, limit=limit)
+            return [{**self.jobs[job_id], 'score': round(score, 3)} for job_id, score in ranked]
+
+    def _loaded(self, jobs):
+        for job in jobs:
+            if isinstance(job['id'], int) and (self._loaded_id is None or job['id'] > self._loaded_id):
+                self._loaded_id = job['id']
+        return jobs
+
+    def refresh(self, job_listings, force=False):
+        """
+        Bring the index up to date from a job_listings repository: a full rebuild
+        on first use or when it is old, otherwise only fetch listings added since
+        the last refresh. Listings this process upserted itself don't count as
+        read, so listings other processes added with lower IDs are still fetched.
+        """
+        now = time.time()
+        with self._lock:
+            if force or not self._rebuilt_at or now - self._rebuilt_at > REBUILD_INTERVAL:
+                self._loaded_id = None
+                self.build(self._loaded(job_listings.list_for_index()))
+                self._rebuilt_at = self._refreshed_at = now
+            elif now - self._refreshed_at > REFRESH_INTERVAL:
+                for job in self._loaded(job_listings.list_for_index(after_id=self._loaded_id)):
+                    self.upsert(job)
+                self._refreshed_at = now
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_index():
+    """Return the process-wide job index (empty until refreshed)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JobIndex()
+        return _index
@@ -1,6 +1,56 @@
 import streamlit as st
-import pymysql
-from Home_test import connect_db
+from repositories import get_repositories, DATA_BACKEND, JOB_LIST_BACKEND
+from job_index import get_job_index
+from query_cache import get_query_cache
+
+def fetch_parent_jobs(parent_email):
+    """Fetch the parent's listings (narrow projection) through the query cache."""
+    return get_query_cache().get_or_load(
+        "job_listings", "by_parent", {"parent_email": parent_email},
+        lambda: get_repositories(JOB_LIST_BACKEND).job_listings.list_for_parent(parent_email),
+    )
+
+def invalidate_listings(parent_email, job_titles=()):
+    """Drop the cached queries a write to these listings makes stale: the parent's list and the title lookups."""
+    query_cache = get_query_cache()
+    query_cache.discard("job_listings", "by_parent", {"parent_email": parent_email})
+    for job_title in set(job_titles):
+        query_cache.discard("job_listings", "by_title", {"job_title": job_title})
+
+def _job_titles(job_ids, parent_email):
+    job_ids = set(job_ids)
+    return [job['job_title'] for job in fetch_parent_jobs(parent_email) or [] if job['id'] in job_ids]
+
+def _update_job_index(job_ids, job_listings=None):
+    """
+    Apply a job list write to the job index: drop the listings, then re-add
+    those job_listings says are (still) active. The index is built from the
+    DATA_BACKEND repository, so a write to another backend only forces a rebuild.
+    """
+    job_index = get_job_index()
+    if JOB_LIST_BACKEND != DATA_BACKEND:
+        job_index.invalidate()
+        return
+    for job_id in job_ids:
+        job_index.remove(job_id)
+    if job_listings is not None:
+        for job in job_listings.list_for_index(job_ids=job_ids):
+            job_index.upsert(job)
+
+def set_jobs_active(job_ids, is_active, parent_email):
+    """Activate or deactivate several listings in one transaction."""
+    job_titles = _job_titles(job_ids, parent_email)
+    job_listings = get_repositories(JOB_LIST_BACKEND).job_listings
+    job_listings.set_active(job_ids, is_active, parent_email)
+    _update_job_index(job_ids, job_listings if is_active else None)
+    invalidate_listings(parent_email, job_titles)
+
+def delete_jobs(job_ids, parent_email):
+    """Delete several listings in one transaction."""
+    job_titles = _job_titles(job_ids, parent_email)
+    get_repositories(JOB_LIST_BACKEND).job_listings.delete(job_ids, parent_email)
+    _update_job_index(job_ids)
+    invalidate_listings(parent_email, job_titles)
 
 def job_list():
     st.title("📋 Manage Job Listings")
@@ -16,19 +66,13 @@ def job_list():
 
     # Fetch parent's email from session state
     parent_email = st.session_state.get("email")
-    conn = connect_db()
 
     # Fetch job listings for the parent
     jobs = []
-    if conn:
-        try:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            cursor.execute("SELECT * FROM job_listings WHERE parent_email = %s", (parent_email,))
-            jobs = cursor.fetchall()
-        except Exception as e:
-            st.error(f"Error fetching job listings: {e}")
-        finally:
-            conn.close()
+    try:
+        jobs = fetch_parent_jobs(parent_email) or []
+    except Exception as e:
+        st.error(f"Error fetching job listings: {e}")
 
     # Display job listings
     if not jobs:
@@ -37,7 +81,35 @@ def job_list():
 
     st.subheader("Your Job Listings")
 
+    # Bulk actions on the listings ticked below, each run as a single transaction
+    selected_ids = [job['id'] for job in jobs if st.session_state.get(f"select_{job['id']}")]
+    bulk_action = None
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("Activate Selected", key="bulk_activate", disabled=not selected_ids):
+            bulk_action = "activate"
+    with col2:
+        if st.button("Deactivate Selected", key="bulk_deactivate", disabled=not selected_ids):
+            bulk_action = "deactivate"
+    with col3:
+        if st.button("Delete Selected", key="bulk_delete", disabled=not selected_ids):
+            bulk_action = "delete"
+
+    if bulk_action:
+        try:
+            if bulk_action == "delete":
+                delete_jobs(selected_ids, parent_email)
+            else:
+                set_jobs_active(selected_ids, bulk_action == "activate", parent_email)
+        except Exception as e:
+            st.error(f"Error updating job listings: {e}")
+        else:
+            for job_id in selected_ids:
+                st.session_state.pop(f"select_{job_id}", None)
+            st.rerun()
+
     for job in jobs:
+        st.checkbox(f"Select {job['job_title']}", key=f"select_{job['id']}")
         st.markdown(f"### {job['job_title']}")
         st.markdown(f"**Description:** {job['job_description']}")
 
@@ -65,36 +137,23 @@ def job_list():
         # Handle status toggle
         if toggle_status:
             new_status = not job.get('is_active', False)
-            conn = connect_db()
-            if conn:
-                try:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        "UPDATE job_listings SET is_active = %s WHERE id = %s",
-                        (new_status, job['id'])
-                    )
-                    conn.commit()
-                    st.success(f"Job status updated to {'Active' if new_status else 'Inactive'}.")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error updating job status: {e}")
-                finally:
-                    conn.close()
+            try:
+                set_jobs_active([job['id']], new_status, parent_email)
+            except Exception as e:
+                st.error(f"Error updating job status: {e}")
+            else:
+                st.success(f"Job status updated to {'Active' if new_status else 'Inactive'}.")
+                st.rerun()
 
         # Handle job deletion
         if delete_job:
-            conn = connect_db()
-            if conn:
-                try:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM job_listings WHERE id = %s", (job['id'],))
-                    conn.commit()
-                    st.success("Job deleted successfully.")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error deleting job: {e}")
-                finally:
-                    conn.close()
+            try:
+                delete_jobs([job['id']], parent_email)
+            except Exception as e:
+                st.error(f"Error deleting job: {e}")
+            else:
+                st.success("Job deleted successfully.")
+                st.rerun()
 
 # Ensure this is only run when the script is directly executed
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+import re
+import threading
+
+import numpy as np
+from scipy import sparse
+
+# Fields that make up a listing's document, with how many times each field's tokens count
+RANKED_FIELDS = {
+    'job_title': 2,
+    'job_subject': 2,
+    'required_skills': 3,
+    'job_description': 1,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'will', 'with', 'you', 'your',
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens with stop words removed."""
+    return [token for token in TOKEN_PATTERN.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+class JobRanker:
+    """
+    BM25 ranking over job listings backed by a sparse term-weight matrix.
+
+    A query is a single sparse vector-matrix product plus a top-k selection.
+    Listings added since the last rebuild are scored on the fly against the
+    current IDF statistics and only folded into the matrix (a vectorised,
+    O(non-zeros) rebuild) once enough of them have accumulated.
+    """
+
+    # Pending listings are merged into the matrix once they exceed this share of it
+    MERGE_FRACTION = 0.01
+    MIN_MERGE_SIZE = 256
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._vocab = {}
+        self._row_of = {}        # job id -> row in the matrix
+        self._job_ids = []       # row -> job id (None for removed rows)
+        self._alive = np.zeros(0, dtype=bool)
+        self._tf = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._pending = {}       # job id -> {column: tf}, not yet in self._tf
+        self._dead_rows = 0
+        self._weights_t = None   # vocabulary x jobs BM25 weights, None when a rebuild is due
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._avg_len = 0.0
+
+    def __len__(self):
+        return len(self._row_of) + len(self._pending)
+
+    def _document_counts(self, job):
+        counts = {}
+        for field, repeat in RANKED_FIELDS.items():
+            for token in tokenize(job.get(field)):
+                column = self._vocab.setdefault(token, len(self._vocab))
+                counts[column] = counts.get(column, 0) + repeat
+        return counts
+
+    def upsert(self, job):
+        """Add a listing, or replace it if it is already ranked."""
+        with self._lock:
+            self._remove(job['id'])
+            self._pending[job['id']] = self._document_counts(job)
+            if len(self._pending) > max(self.MIN_MERGE_SIZE, self.MERGE_FRACTION * len(self._row_of)):
+                self._weights_t = None
+
+    def _remove(self, job_id):
+        self._pending.pop(job_id, None)
+        row = self._row_of.pop(job_id, None)
+        if row is not None:
+            start, end = self._tf.indptr[row], self._tf.indptr[row + 1]
+            self._tf.data[start:end] = 0
+            self._job_ids[row] = None
+            self._alive[row] = False
+            self._dead_rows += 1
+            # Compact away removed rows once they make up a quarter of the matrix
+            if self._dead_rows * 4 > len(self._job_ids):
+                self._weights_t = None
+
+    def remove(self, job_id):
+        """Drop a listing from the ranking."""
+        with self._lock:
+            self._remove(job_id)
+
+    def build(self, jobs):
+        """Replace every listing at once."""
+        with self._lock:
+            self._vocab = {}
+            self._row_of = {}
+            self._job_ids = []
+            self._alive = np.zeros(0, dtype=bool)
+            self._tf = sparse.csr_matrix((0, 0), dtype=np.float32)
+            self._pending = {job['id']: self._document_counts(job) for job in jobs}
+            self._dead_rows = 0
+            self._weights_t = None
+
+    def _merge_pending(self):
+        if self._dead_rows:
+            keep = [row for row, job_id in enumerate(self._job_ids) if job_id is not None]
+            self._tf = self._tf[keep]
+            self._job_ids = [self._job_ids[row] for row in keep]
+            self._row_of = {job_id: row for row, job_id in enumerate(self._job_ids)}
+            self._dead_rows = 0
+
+        if self._pending:
+            indptr = [0]
+            indices = []
+            data = []
+            for job_id, counts in self._pending.items():
+                indices.extend(counts.keys())
+                data.extend(counts.values())
+                indptr.append(len(indices))
+                self._row_of[job_id] = len(self._job_ids)
+                self._job_ids.append(job_id)
+            block = sparse.csr_matrix(
+                (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+                shape=(len(self._pending), len(self._vocab)),
+            )
+            existing = self._tf
+            existing.resize((existing.shape[0], len(self._vocab)))
+            self._tf = sparse.vstack([existing, block], format='csr')
+            self._pending = {}
+        self._tf.eliminate_zeros()
+        self._alive = np.ones(len(self._job_ids), dtype=bool)
+
+    def _ensure_weights(self):
+        if self._weights_t is not None:
+            return
+        self._merge_pending()
+        tf = self._tf
+        n_docs = len(self._row_of)
+        doc_len = np.asarray(tf.sum(axis=1)).ravel()
+        self._avg_len = float(doc_len.sum()) / n_docs if n_docs else 0.0
+        doc_freq = np.bincount(tf.indices, minlength=tf.shape[1])
+        self._idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        # BM25 term weight for every non-zero, computed in one vectorised pass
+        rows = np.repeat(np.arange(tf.shape[0]), np.diff(tf.indptr))
+        norm = self.k1 * (1 - self.b + self.b * doc_len[rows] / self._avg_len) if self._avg_len else self.k1
+        weights = tf.copy()
+        weights.data = self._idf[tf.indices] * tf.data * (self.k1 + 1) / (tf.data + norm)
+        self._weights_t = weights.T.tocsr()
+
+    def _pending_scores(self, columns, candidate_ids):
+        # Score listings not yet in the matrix with the IDF of the last rebuild
+        n_docs = len(self._row_of) + len(self._pending)
+        unseen_idf = float(np.log1p((n_docs - 0.5) / 1.5))
+        results = []
+        for job_id, counts in self._pending.items():
+            if candidate_ids is not None and job_id not in candidate_ids:
+                continue
+            doc_len = sum(counts.values())
+            norm = self.k1 * (1 - self.b + self.b * doc_len / self._avg_len) if self._avg_len else self.k1
+            score = 0.0
+            for column in columns:
+                tf = counts.get(column)
+                if tf:
+                    idf = float(self._idf[column]) if column < len(self._idf) and self._idf[column] > 0 else unseen_idf
+                    score += idf * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                results.append((job_id, score))
+        return results
+
+    def rank(self, query_text, top_k=20, candidate_ids=None):
+        """Return up to top_k (job id, score) pairs with a positive score, best first."""
+        with self._lock:
+            self._ensure_weights()
+            columns = {self._vocab[token] for token in tokenize(query_text) if token in self._vocab}
+            if not columns or not len(self):
+                return []
+            if candidate_ids is not None:
+                candidate_ids = set(candidate_ids)
+
+            matrix_columns = [column for column in columns if column < self._weights_t.shape[0]]
+            query = sparse.csr_matrix(
+                (np.ones(len(matrix_columns), dtype=np.float32),
+                 (np.zeros(len(matrix_columns), dtype=np.int32), matrix_columns)),
+                shape=(1, self._weights_t.shape[0]),
+            )
+            scores = (query @ self._weights_t).toarray().ravel()
+            keep = self._alive.copy()
+            if candidate_ids is not None:
+                mask = np.zeros_like(keep)
+                mask[[self._row_of[job_id] for job_id in candidate_ids if job_id in self._row_of]] = True
+                keep &= mask
+            scores = np.where(keep, scores, 0.0)
+
+            k = min(top_k, int(np.count_nonzero(scores > 0)))
+            ranked = []
+            if k:
+                best = np.argpartition(-scores, k - 1)[:k]
+                ranked = [(self._job_ids[row], float(scores[row])) for row in best]
+            ranked.extend(self._pending_scores(columns, candidate_ids))
+            ranked.sort(key=lambda item: (-item[1], str(item[0])))
+            return ranked[:top_k]
@@ -0,0 +1,111 @@
+import threading
+from collections import deque
+
+from keywords import TAXONOMIES
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over every keyword taxonomy.
+
+    Matching is case-insensitive and respects word boundaries, so 'it' does
+    not match inside 'with'. A single left-to-right pass over the text finds
+    every keyword from every category.
+    """
+
+    def __init__(self, taxonomies):
+        self._goto = [{}]       # state -> {char: next state}
+        self._fail = [0]        # state -> failure link
+        self._output = [[]]     # state -> [(keyword length, keyword)] ending here
+        self._categories = {}   # lowercase keyword -> [category, ...] in taxonomy order
+        for category, keywords in taxonomies.items():
+            for keyword in keywords:
+                term = keyword.strip().lower()
+                if not term:
+                    continue
+                categories = self._categories.setdefault(term, [])
+                if category not in categories:
+                    categories.append(category)
+                    self._add(term)
+        self._build_links()
+
+    def _add(self, term):
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        if (len(term), term) not in self._output[state]:
+            self._output[state].append((len(term), term))
+
+    def _build_links(self):
+        # Breadth-first, so every failure target is finished before it is used; depth-1 states keep failing to the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def categories_for(self, term):
+        """Return the categories an exact keyword belongs to (case-insensitive)."""
+        return list(self._categories.get((term or '').strip().lower(), ()))
+
+    def find(self, text):
+        """Yield (start, end, keyword) for every whole-word keyword occurrence; spans index into text."""
+        lowered = text.lower()
+        origin = None
+        if len(lowered) != len(text):
+            # Some characters lowercase to several ('İ' -> 'i̇'); map lowered positions back to text
+            origin = [i for i, ch in enumerate(text) for _ in ch.lower()]
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, term in output[state]:
+                start, end = i - length + 1, i + 1
+                if _is_word_char(term[0]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(term[-1]) and end < len(lowered) and _is_word_char(lowered[end]):
+                    continue
+                if origin is not None:
+                    start, end = origin[start], origin[end - 1] + 1
+                yield start, end, term
+
+    def scan(self, text):
+        """Return per-category hit counts and (start, end, keyword) spans for the text."""
+        counts = {}
+        spans = {}
+        for start, end, term in self.find(text):
+            for category in self._categories[term]:
+                counts[category] = counts.get(category, 0) + 1
+                spans.setdefault(category, []).append((start, end, term))
+        return {"counts": counts, "spans": spans}
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher():
+    """Return the process-wide matcher compiled from keywords.TAXONOMIES."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = KeywordMatcher(TAXONOMIES)
+        return _matcher
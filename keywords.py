@@ -31,10 +31,10 @@ sj_keywords = ['Bachelor in History','History Teacher','Artifact Analysis','Arch
                 'American History', 'Middle Eastern History', 'African History','History of Religion', 
                 'History of Science', 'Postcolonial Studies']
 
-geo_keywords = ['Bachelor in Geography','Geography Teacher''Natural Disasters', 'Environmental Studies',
+geo_keywords = ['Bachelor in Geography','Geography Teacher', 'Natural Disasters', 'Environmental Studies',
                 'Urbanization', 'Population Studies', 'Biodiversity', 'Water Resources', 
                 'Agriculture Geography', 'Tourism Geography', 'Landforms', 'GPS Tools', 
-                'GIS Software', 'Survey Equipment''Data Visualization', 'Remote Sensing Techniques',
+                'GIS Software', 'Survey Equipment', 'Data Visualization', 'Remote Sensing Techniques',
                 'Satellite Imagery Interpretation', 'Spatial Thinking']
 
 eco_keywords = ['Bachelor in Economics','Health Economics', 'Environmental Economics',
@@ -42,3 +42,23 @@ eco_keywords = ['Bachelor in Economics','Health Economics', 'Environmental Econo
                 'Data Analysis', 'Market Research', 'Policy Analysis', 'Statistical Analysis', 
                 'Economic Forecasting', 'Supply and Demand Analysis', 'Cost-Benefit Analysis',]
 
+
+# Job-facing terms pulled from resume text to match against job listings
+recommendation_keywords = ['Developer', 'Engineer', 'Manager', 'Tutor', 'Designer', 'Analyst',
+                           'Python', 'Java', 'SQL', 'Teaching', 'Communication', 'Leadership',
+                           'Information Technology']
+
+# Every taxonomy by name, compiled together by keyword_matcher
+TAXONOMIES = {
+    'it': it_keywords,
+    'software': software_keywords,
+    'multimedia': multimedia_keywords,
+    'science': science_keywords,
+    'math': math_keywords,
+    'special_education': pk_keyword,
+    'early_childhood': pakk_keywords,
+    'history': sj_keywords,
+    'geography': geo_keywords,
+    'economics': eco_keywords,
+    'recommendation': recommendation_keywords,
+}
@@ -0,0 +1,134 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+MYSQL_CONFIG = {
+    "host": os.environ.get("MYSQL_HOST", "localhost"),
+    "user": os.environ.get("MYSQL_USER", "root"),
+    "password": os.environ.get("MYSQL_PASSWORD", ""),
+    "database": os.environ.get("MYSQL_DATABASE", "cv"),
+    "connect_timeout": int(os.environ.get("MYSQL_CONNECT_TIMEOUT", 5)),
+    "autocommit": False,
+}
+MYSQL_POOL_SIZE = int(os.environ.get("MYSQL_POOL_SIZE", 5))
+MYSQL_POOL_TIMEOUT = float(os.environ.get("MYSQL_POOL_TIMEOUT", 10))
+# Connections idle longer than this are pinged (and reconnected if needed) before reuse
+MYSQL_HEALTHCHECK_AFTER = float(os.environ.get("MYSQL_HEALTHCHECK_AFTER", 30))
+
+
+class PoolExhausted(Exception):
+    """Raised when no pooled connection frees up within the pool timeout."""
+
+
+class MySQLPool:
+    """
+    Bounded pool of pymysql connections.
+
+    At most `size` connections exist at once; callers wait up to `timeout`
+    seconds for one to be returned. Connections are opened lazily, pinged
+    before reuse once they have sat idle, and dropped if a query on them fails.
+    """
+
+    def __init__(self, config=None, size=MYSQL_POOL_SIZE, timeout=MYSQL_POOL_TIMEOUT,
+                 healthcheck_after=MYSQL_HEALTHCHECK_AFTER):
+        self.config = dict(config or MYSQL_CONFIG)
+        self.size = size
+        self.timeout = timeout
+        self.healthcheck_after = healthcheck_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self.stats = {"opened": 0, "reused": 0, "pinged": 0, "discarded": 0}
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolExhausted(f"No MySQL connection became free within {self.timeout:g}s")
+        try:
+            conn, returned_at = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                conn = pymysql.connect(**self.config)
+            except Exception:
+                self._slots.release()
+                raise
+            self._count("opened")
+            return conn
+
+        try:
+            if time.monotonic() - returned_at > self.healthcheck_after:
+                conn.ping(reconnect=True)
+                self._count("pinged")
+        except Exception:
+            self._discard(conn)
+            self._slots.release()
+            raise
+        self._count("reused")
+        return conn
+
+    def _discard(self, conn):
+        self._count("discarded")
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; any open transaction is rolled back before it is returned."""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.rollback()
+        except Exception:
+            # A failed connection may be half-way through a result or a transaction; don't reuse it
+            self._discard(conn)
+            conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put((conn, time.monotonic()))
+            self._slots.release()
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection and run the block as one transaction, committed on success."""
+        with self.connection() as conn:
+            conn.begin()
+            yield conn
+            conn.commit()
+
+    def fetch_all(self, sql, args=None):
+        """Run a read query and return its rows as dicts."""
+        with self.connection() as conn:
+            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, args)
+                return cursor.fetchall()
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_mysql_pool():
+    """Return the process-wide MySQL pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = MySQLPool()
+        return _pool
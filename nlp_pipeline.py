@@ -0,0 +1,96 @@
+import os
+import threading
+
+# Resume parsing only needs POS tags, the dependency parse (noun chunks) and
+# lexical attributes from en_core_web_sm; NER comes from pyresparser's own model.
+EXCLUDED_COMPONENTS = ["ner", "lemmatizer"]
+
+# NLTK corpora pyresparser reads at import time, kept in a local directory
+# so startup never has to reach the network once they are installed.
+NLTK_DATA_DIR = os.environ.get("NLTK_DATA_DIR", "./nltk_data")
+NLTK_CORPORA = {"stopwords": "corpora/stopwords"}
+
+_resources = {}
+_resources_lock = threading.RLock()   # re-entrant: the name matcher loader loads the nlp pipeline
+
+
+def _load(name, loader):
+    with _resources_lock:
+        if name not in _resources:
+            _resources[name] = loader()
+        return _resources[name]
+
+
+def ensure_nltk_data(download=True):
+    """Point NLTK at the local data directory, downloading missing corpora into it once."""
+    import nltk
+
+    data_dir = os.path.abspath(NLTK_DATA_DIR)
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    for package, resource in NLTK_CORPORA.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            if not download:
+                raise
+            nltk.download(package, download_dir=data_dir, quiet=True)
+
+
+def get_nlp():
+    """Return the shared en_core_web_sm pipeline, loaded once per process."""
+    import spacy
+
+    return _load("nlp", lambda: spacy.load("en_core_web_sm", exclude=EXCLUDED_COMPONENTS))
+
+
+def get_custom_nlp():
+    """Return pyresparser's custom NER model, loaded once per process."""
+    import spacy
+    import pyresparser
+
+    return _load("custom_nlp", lambda: spacy.load(os.path.dirname(os.path.abspath(pyresparser.__file__))))
+
+
+def get_name_matcher():
+    """Return a Matcher for two consecutive proper nouns, built once."""
+    from spacy.matcher import Matcher
+    from pyresparser import constants as cs
+
+    def build():
+        matcher = Matcher(get_nlp().vocab)
+        matcher.add("NAME", [cs.NAME_PATTERN])
+        return matcher
+
+    return _load("name_matcher", build)
+
+
+def get_skills():
+    """Return pyresparser's skill vocabulary as a set, read from skills.csv once."""
+    import pandas as pd
+    import pyresparser
+
+    def build():
+        skills_csv = os.path.join(os.path.dirname(os.path.abspath(pyresparser.__file__)), "skills.csv")
+        return set(pd.read_csv(skills_csv).columns.values)
+
+    return _load("skills", build)
+
+
+def preload():
+    """Load every shared NLP resource now instead of on the first resume."""
+    ensure_nltk_data()
+    get_nlp()
+    get_custom_nlp()
+    get_name_matcher()
+    get_skills()
+
+
+def pipe(texts, batch_size=16, n_process=1):
+    """Run many texts through the shared pipeline in batches (spaCy's nlp.pipe)."""
+    return get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+
+
+def pipe_custom(texts, batch_size=16, n_process=1):
+    """Run many texts through the custom NER model in batches."""
+    return get_custom_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
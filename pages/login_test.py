@@ -1,20 +1,15 @@
 import streamlit as st
 import bcrypt
 import base64
-from supabase import create_client
+from repositories import get_repositories
 
-def init_supabase():
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    return create_client(supabase_url, supabase_key)
 
+@st.cache_data(show_spinner=False)
 def get_base64_image(image_path):
     with open(image_path, "rb") as image_file:
         encoded = base64.b64encode(image_file.read()).decode()
     return encoded
 
-background_image = get_base64_image('./Logo/background1.png')
-
 def login():
     # Initialize session state if needed
     if "logged_in" not in st.session_state:
@@ -22,6 +17,7 @@ def login():
     if "page" not in st.session_state:
         st.session_state.page = "login"
 
+    background_image = get_base64_image('./Logo/background1.png')
     st.markdown(
     f"""
     <style>
@@ -107,13 +103,10 @@ def login():
     
     if st.button("Log In", key="login_submit"):
         try:
-            supabase = init_supabase()
-            
             # Query user by email
-            response = supabase.table('users').select("*").eq('email', email).execute()
+            user = get_repositories().users.get_by_email(email)
             
-            if response.data:
-                user = response.data[0]
+            if user:
                 stored_password = user['password']
                 if isinstance(stored_password, str):
                     stored_password = stored_password.encode('utf-8')
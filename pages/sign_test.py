@@ -2,20 +2,15 @@ import streamlit as st
 import re
 import bcrypt
 import base64
-from supabase import create_client
+from repositories import get_repositories
 
-def init_supabase():
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    return create_client(supabase_url, supabase_key)
 
+@st.cache_data(show_spinner=False)
 def get_base64_image(image_path):
     with open(image_path, "rb") as image_file:
         encoded = base64.b64encode(image_file.read()).decode()
     return encoded
 
-background_image = get_base64_image('./Logo/background1.png')
-
 def is_valid_email(email):
     email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(email_regex, email) is not None
@@ -29,6 +24,7 @@ def is_valid_password(password):
     )
 
 def signup():
+    background_image = get_base64_image('./Logo/background1.png')
     st.markdown(
     f"""
     <style>
@@ -138,17 +134,15 @@ def signup():
             return
 
         try:
-            supabase = init_supabase()
+            users = get_repositories().users
             
             # Check if email exists
-            email_check = supabase.table('users').select("*").eq('email', email).execute()
-            if email_check.data:
+            if users.get_by_email(email):
                 st.error("Email already registered. Please use a different email.")
                 return
 
             # Check if username exists
-            username_check = supabase.table('users').select("*").eq('username', username).execute()
-            if username_check.data:
+            if users.get_by_username(username):
                 st.error("Username already taken. Please choose a different username.")
                 return
 
@@ -165,9 +159,9 @@ def signup():
                 'user_type': user_type
             }
             
-            result = supabase.table('users').insert(user_data).execute()
+            result = users.create(user_data)
             
-            if result.data:
+            if result:
                 st.success("Account created successfully!")
                 st.session_state["page"] = "login"
                 st.rerun()
@@ -0,0 +1,55 @@
+import streamlit as st
+
+PAGE_SIZE = 10
+
+
+def keyset_cursor(*fields):
+    """
+    Next-page cursor for keyset pagination: the sort key of the last row shown,
+    a tuple when the list is ordered by several columns.
+    """
+    if len(fields) == 1:
+        return lambda cursor, items: items[-1][fields[0]]
+    return lambda cursor, items: tuple(items[-1][field] for field in fields)
+
+
+def offset_cursor(cursor, items):
+    """Next-page cursor for ranked in-memory lists: how many items came before the next page."""
+    return (cursor or 0) + len(items)
+
+
+def reset_pagination(key):
+    """Go back to the first page of a list, e.g. after its query changed."""
+    st.session_state.pop(f"{key}_cursors", None)
+
+
+def paginated_list(key, fetch_page, render_item, page_size=PAGE_SIZE, next_cursor=offset_cursor):
+    """
+    Render one page of a list with Previous/Next buttons and return its items.
+
+    fetch_page(cursor, limit) returns up to limit items starting at cursor
+    (None for the first page); only the current page is ever fetched or
+    rendered. The cursors of the pages visited so far are kept in
+    st.session_state so Previous goes back without recomputing them.
+    """
+    cursors = st.session_state.setdefault(f"{key}_cursors", [None])
+    # One extra row tells us whether there is a next page without counting the table
+    items = list(fetch_page(cursors[-1], page_size + 1))
+    has_next = len(items) > page_size
+    items = items[:page_size]
+
+    for item in items:
+        render_item(item)
+
+    if len(cursors) > 1 or has_next:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if len(cursors) > 1:
+                st.button("← Previous", key=f"{key}_prev", on_click=cursors.pop)
+        with col2:
+            st.caption(f"Page {len(cursors)}")
+        with col3:
+            if has_next:
+                st.button("Next →", key=f"{key}_next", on_click=cursors.append,
+                          args=(next_cursor(cursors[-1], items),))
+    return items
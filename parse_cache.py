@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Bump this whenever the parsing pipeline changes so stale entries are never served
+PARSER_VERSION = "pyresparser-1.0.6+pdfminer3/2"
+
+CACHE_DIR = "./Parse_Cache"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def resume_cache_key(pdf_bytes, parser_version=PARSER_VERSION):
+    """Return the SHA-256 cache key for the given PDF bytes and parser version."""
+    digest = hashlib.sha256()
+    digest.update(parser_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(pdf_bytes)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Size-bounded on-disk LRU cache for resume parse results."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, parser_version=PARSER_VERSION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_existing(self):
+        # Rebuild the LRU order from file modification times so recency survives restarts
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, pdf_bytes):
+        """Return the cached parse result for these PDF bytes, or None on a miss."""
+        key = resume_cache_key(pdf_bytes, self.parser_version)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+            self.hits += 1
+            return result
+
+    def put(self, pdf_bytes, result):
+        """Store a JSON-serialisable parse result for these PDF bytes."""
+        key = resume_cache_key(pdf_bytes, self.parser_version)
+        payload = json.dumps(result, default=str).encode("utf-8")
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Error writing parse cache entry: {e}")
+                return
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def trim(self):
+        """Re-read the directory, including entries other processes wrote, and evict down to max_bytes."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._load_existing()
+
+    def clear(self):
+        """Remove every cached entry from disk."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache():
+    """Return the process-wide parse cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParseCache()
+        return _cache
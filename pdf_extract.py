@@ -0,0 +1,86 @@
+import io
+from collections import namedtuple
+
+# Everything the resume pipeline needs from one PDF, produced by a single pdfminer pass
+PDFExtraction = namedtuple("PDFExtraction", ["text", "pages", "page_count", "layout"])
+
+
+def _open_source(source):
+    """Return a binary file object for a path, raw bytes, a buffer, an mmap or an already open file."""
+    if isinstance(source, memoryview) and isinstance(source.obj, bytes) and source.nbytes == len(source.obj):
+        # BytesIO shares an immutable bytes object but would copy a view of it
+        source = source.obj
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source), True
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source, False
+    return open(source, "rb"), True
+
+
+def _render_page(ltpage):
+    """Render an analysed page the same way pdfminer's TextConverter does."""
+    from pdfminer3.layout import LTContainer, LTText, LTTextBox
+
+    chunks = []
+    boxes = []
+
+    def render(item):
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            chunks.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            chunks.append("\n")
+            boxes.append({
+                "bbox": [round(v, 2) for v in item.bbox],
+                "text": item.get_text(),
+            })
+
+    render(ltpage)
+    chunks.append("\f")
+    return "".join(chunks), {"page": ltpage.pageid, "bbox": [round(v, 2) for v in ltpage.bbox], "boxes": boxes}
+
+
+def extract_pdf(source):
+    """Open the PDF once and return its text, per-page text, page count and text-box layout."""
+    from pdfminer3.layout import LAParams
+    from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer3.converter import PDFPageAggregator
+    from pdfminer3.pdfpage import PDFPage
+
+    resource_manager = PDFResourceManager()
+    device = PDFPageAggregator(resource_manager, laparams=LAParams())
+    page_interpreter = PDFPageInterpreter(resource_manager, device)
+
+    pages = []
+    layout = []
+    fh, should_close = _open_source(source)
+    try:
+        for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
+            page_interpreter.process_page(page)
+            page_text, page_layout = _render_page(device.get_result())
+            pages.append(page_text)
+            layout.append(page_layout)
+    finally:
+        device.close()
+        if should_close:
+            fh.close()
+
+    return PDFExtraction(text="".join(pages), pages=pages, page_count=len(pages), layout=layout)
+
+
+def pdf_page_count(source):
+    """Read the page count from the document's page tree without parsing any page content."""
+    from pdfminer3.pdfparser import PDFParser
+    from pdfminer3.pdfdocument import PDFDocument
+    from pdfminer3.pdftypes import resolve1
+
+    fh, should_close = _open_source(source)
+    try:
+        document = PDFDocument(PDFParser(fh))
+        return int(resolve1(resolve1(document.catalog["Pages"])["Count"]))
+    finally:
+        if should_close:
+            fh.close()
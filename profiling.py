@@ -0,0 +1,62 @@
+"""
+On-demand cProfile of single reruns.
+
+profiled() runs a block under cProfile and writes two files to PROFILE_DIR:
+the raw .prof stats (open with snakeviz, or turn into a flame graph with
+flameprof / gprof2dot) and a .txt summary of the PROFILE_TOP_N functions by
+cumulative time. cProfile only hooks the thread that enables it, so other
+sessions' script threads run unprofiled.
+"""
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import re
+from contextlib import contextmanager
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "./profiles")
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", 25))
+# Sessions opt in with ?profile=<token>; profiling is off entirely while this is unset
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+
+
+class ProfileResult:
+    """Where a profiled run was saved, and its top-N summary."""
+
+    def __init__(self, label):
+        self.label = label
+        self.prof_path = None
+        self.summary_path = None
+        self.summary = ""
+        self.total_s = 0.0
+
+
+def top_functions(profiler, top_n=PROFILE_TOP_N, sort_by="cumulative"):
+    """The pstats table of the top_n functions, as text."""
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs().sort_stats(sort_by).print_stats(top_n)
+    return out.getvalue(), stats.total_tt
+
+
+@contextmanager
+def profiled(label, profile_dir=PROFILE_DIR, top_n=PROFILE_TOP_N):
+    """Profile the block and save <timestamp>_<label>.prof and .txt; yields the ProfileResult."""
+    result = ProfileResult(label)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        # Also reached when the page ends the run with st.rerun()/st.stop()
+        profiler.disable()
+        os.makedirs(profile_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base = os.path.join(profile_dir, f"{stamp}_{re.sub(r'[^A-Za-z0-9_.-]', '_', label)}")
+        result.prof_path = base + ".prof"
+        result.summary_path = base + ".txt"
+        profiler.dump_stats(result.prof_path)
+        result.summary, result.total_s = top_functions(profiler, top_n)
+        with open(result.summary_path, "w", encoding="utf-8") as f:
+            f.write(result.summary)
@@ -0,0 +1,106 @@
+import os
+import sys
+import threading
+
+from cachetools import TTLCache
+
+QUERY_CACHE_TTL = float(os.environ.get("QUERY_CACHE_TTL", 60))
+QUERY_CACHE_MAX_BYTES = int(os.environ.get("QUERY_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalize(item)) for key, item in value.items()))
+    return value
+
+
+def query_key(table, query, params=None):
+    """Cache key for a query: table, whitespace-normalised query name and sorted parameters."""
+    return table, _normalize(query), _normalize(params or {})
+
+
+def estimate_size(value):
+    """Rough in-memory size of a query result in bytes."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    """
+    Read-through cache for query results with a TTL, a byte budget and LRU
+    eviction. Every entry is tagged with its table (plus any extra tags the
+    caller gives) so writes can drop exactly the results they make stale.
+    """
+
+    def __init__(self, max_bytes=QUERY_CACHE_MAX_BYTES, ttl=QUERY_CACHE_TTL):
+        self._cache = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=lambda entry: entry[2])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, table, query, params, loader, tags=()):
+        """Return the cached result for the query, calling loader() to fill it on a miss."""
+        key = query_key(table, query, params)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        result = loader()
+        entry = (result, frozenset((table,) + tuple(tags)), estimate_size(result))
+        with self._lock:
+            # None means the load failed; results bigger than the whole budget are never stored
+            if result is not None and entry[2] <= self._cache.maxsize:
+                self._cache[key] = entry
+        return result
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of the given tags (a table name or a caller tag)."""
+        tags = set(tags)
+        with self._lock:
+            stale = [key for key, entry in self._cache.items() if entry[1] & tags]
+            for key in stale:
+                del self._cache[key]
+        return len(stale)
+
+    def discard(self, table, query, params=None):
+        """Drop the one entry cached for this query, if any."""
+        with self._lock:
+            return self._cache.pop(query_key(table, query, params), None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "bytes": self._cache.currsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache():
+    """Return the process-wide query cache."""
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryCache()
+        return _query_cache
@@ -0,0 +1,522 @@
+"""
+Data access for the app's tables, behind one interface per table.
+
+get_repositories() returns a Repositories bundle (users, job_listings,
+job_applications, feedback, user_data) for one backend:
+
+    supabase  the hosted project, through the shared pooled client (default)
+    mysql     the MySQL database job_list has always used, through mysql_pool
+    sqlite    an embedded database with the indexes in sql/schema_sqlite.sql,
+              for running the app, tests and benchmarks without network
+
+DATA_BACKEND picks the backend for the app; JOB_LIST_BACKEND the one behind
+the parent's job list, which historically lives in MySQL.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import tracing
+
+DATA_BACKEND = os.environ.get("DATA_BACKEND", "supabase")
+JOB_LIST_BACKEND = os.environ.get("JOB_LIST_BACKEND", "mysql" if DATA_BACKEND == "supabase" else DATA_BACKEND)
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "./app_data.sqlite3")
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "schema_sqlite.sql")
+
+# Columns the job index and search need, instead of select('*')
+JOB_INDEX_COLUMNS = ["id", "job_title", "job_subject", "job_description", "required_skills", "hourly_rate", "city", "state"]
+# Characters of the description shown in the parent's job list
+LISTING_DESCRIPTION_CHARS = 300
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+# SQL backends (SQLite and MySQL share the repositories below)
+
+class _Transaction:
+    """Runs '?'-style SQL on one DB-API cursor and returns rows as dicts."""
+
+    def __init__(self, cursor, placeholder, system):
+        self.cursor = cursor
+        self.placeholder = placeholder
+        self.system = system
+
+    def _sql(self, sql):
+        return sql if self.placeholder == "?" else sql.replace("?", self.placeholder)
+
+    def _span(self, sql):
+        return tracing.span(sql.split(None, 1)[0].upper(), kind="db", **{"db.system": self.system, "db.statement": sql})
+
+    def fetch_all(self, sql, args=()):
+        with self._span(sql):
+            self.cursor.execute(self._sql(sql), tuple(args))
+            columns = [column[0] for column in self.cursor.description or ()]
+            return [row if isinstance(row, dict) else dict(zip(columns, row)) for row in self.cursor.fetchall()]
+
+    def fetch_one(self, sql, args=()):
+        rows = self.fetch_all(sql, args)
+        return rows[0] if rows else None
+
+    def execute(self, sql, args=()):
+        """Run a write and return (rows affected, last inserted id)."""
+        with self._span(sql):
+            self.cursor.execute(self._sql(sql), tuple(args))
+            return self.cursor.rowcount, self.cursor.lastrowid
+
+    def execute_many(self, sql, rows):
+        with self._span(sql):
+            self.cursor.executemany(self._sql(sql), [tuple(row) for row in rows])
+            return self.cursor.rowcount
+
+
+class SQLiteBackend:
+    """One shared SQLite connection; every statement runs in an explicit transaction."""
+
+    name = "sqlite"
+    insert_ignore = "INSERT OR IGNORE"
+    locking_read = ""   # the process-wide lock already serialises transactions
+
+    def __init__(self, path=SQLITE_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._conn.execute("pragma foreign_keys = on")
+        if path != ":memory:":
+            self._conn.execute("pragma journal_mode = wal")
+        with open(SQLITE_SCHEMA, "r", encoding="utf-8") as f:
+            self._conn.executescript(f.read())
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("begin")
+            try:
+                yield _Transaction(cursor, "?", self.name)
+            except BaseException:
+                cursor.execute("rollback")
+                raise
+            cursor.execute("commit")
+
+    def fetch_all(self, sql, args=()):
+        with self.transaction() as tx:
+            return tx.fetch_all(sql, args)
+
+
+class MySQLBackend:
+    """Borrows pooled pymysql connections from mysql_pool."""
+
+    name = "mysql"
+    insert_ignore = "INSERT IGNORE"
+    # Under REPEATABLE READ a plain SELECT reads the transaction's snapshot; a locking read sees committed rows
+    locking_read = " FOR UPDATE"
+
+    def __init__(self, pool=None):
+        from mysql_pool import get_mysql_pool
+
+        self.pool = pool or get_mysql_pool()
+
+    @contextmanager
+    def transaction(self):
+        import pymysql
+
+        with self.pool.transaction() as conn:
+            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                yield _Transaction(cursor, "%s", self.name)
+
+    def fetch_all(self, sql, args=()):
+        with self.transaction() as tx:
+            return tx.fetch_all(sql, args)
+
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+
+class SQLUsers:
+    def __init__(self, db):
+        self.db = db
+
+    def get_by_email(self, email):
+        rows = self.db.fetch_all("SELECT * FROM users WHERE email = ?", (email,))
+        return rows[0] if rows else None
+
+    def get_by_username(self, username):
+        rows = self.db.fetch_all("SELECT * FROM users WHERE username = ?", (username,))
+        return rows[0] if rows else None
+
+    def authenticate(self, email, password):
+        """The user's id for matching credentials, or None; the stored password never leaves the database."""
+        rows = self.db.fetch_all("SELECT id FROM users WHERE email = ? AND password = ?", (email, password))
+        return rows[0]["id"] if rows else None
+
+    def create(self, user):
+        with self.db.transaction() as tx:
+            _, user_id = tx.execute(
+                f"INSERT INTO users ({', '.join(user)}) VALUES ({_placeholders(user)})", user.values()
+            )
+            return tx.fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
+
+
+class SQLJobListings:
+    def __init__(self, db):
+        self.db = db
+
+    def list_for_index(self, after_id=None, job_ids=None):
+        """
+        Active listings with the columns the job index needs, optionally only
+        those newer than after_id or with the given IDs.
+        """
+        sql = f"SELECT {', '.join(JOB_INDEX_COLUMNS)} FROM job_listings WHERE is_active = ?"
+        args = [True]
+        if after_id is not None:
+            sql += " AND id > ?"
+            args.append(after_id)
+        if job_ids is not None:
+            job_ids = list(job_ids)
+            if not job_ids:
+                return []
+            sql += f" AND id IN ({', '.join('?' * len(job_ids))})"
+            args.extend(job_ids)
+        return self.db.fetch_all(sql + " ORDER BY id", args)
+
+    def find_by_title(self, job_title):
+        return self.db.fetch_all("SELECT id, job_title, city, state FROM job_listings WHERE job_title = ?", (job_title,))
+
+    def list_for_parent(self, parent_email):
+        """The parent's listings for the job list view: id, title, shortened description, is_active."""
+        return self.db.fetch_all(
+            "SELECT id, job_title, substr(job_description, 1, ?) AS job_description, is_active "
+            "FROM job_listings WHERE parent_email = ? ORDER BY id DESC",
+            (LISTING_DESCRIPTION_CHARS, parent_email),
+        )
+
+    def create(self, listing):
+        with self.db.transaction() as tx:
+            _, job_id = tx.execute(
+                f"INSERT INTO job_listings ({', '.join(listing)}) VALUES ({_placeholders(listing)})",
+                listing.values(),
+            )
+            return tx.fetch_one("SELECT * FROM job_listings WHERE id = ?", (job_id,))
+
+    def set_active(self, job_ids, is_active, parent_email):
+        with self.db.transaction() as tx:
+            tx.execute_many(
+                "UPDATE job_listings SET is_active = ? WHERE id = ? AND parent_email = ?",
+                [(is_active, job_id, parent_email) for job_id in job_ids],
+            )
+
+    def delete(self, job_ids, parent_email):
+        with self.db.transaction() as tx:
+            tx.execute_many(
+                "DELETE FROM job_listings WHERE id = ? AND parent_email = ?",
+                [(job_id, parent_email) for job_id in job_ids],
+            )
+
+
+class SQLJobApplications:
+    def __init__(self, db):
+        self.db = db
+
+    def submit(self, user_id, job_id, resume_path, teaching_style, availability):
+        """
+        Create the application, or return the one this user already has for the job.
+        Returns (application, created), or (None, False) if the job does not exist.
+        """
+        with self.db.transaction() as tx:
+            job = tx.fetch_one("SELECT city, state FROM job_listings WHERE id = ?", (job_id,))
+            if job is None:
+                return None, False
+            # The unique (user_id, job_id) key settles concurrent double-submits
+            inserted, _ = tx.execute(
+                f"{self.db.insert_ignore} INTO job_applications"
+                " (user_id, job_id, resume_path, teaching_style, availability, is_confirmed, created_at, status)"
+                " VALUES (?, ?, ?, ?, ?, 0, ?, 'Pending')",
+                (user_id, job_id, resume_path, teaching_style, availability, _now()),
+            )
+            # When a concurrent submit won, its row only became visible to a locking read
+            application = tx.fetch_one(
+                "SELECT id, user_id, job_id, status, created_at FROM job_applications WHERE user_id = ? AND job_id = ?"
+                + self.db.locking_read,
+                (user_id, job_id),
+            )
+            if application is None:
+                raise RuntimeError(f"Application for job {job_id} was neither created nor found")
+            return {**application, "city": job["city"], "state": job["state"]}, inserted > 0
+
+    def list_for_user(self, user_id):
+        return self.db.fetch_all(
+            "SELECT j.job_title, j.job_subject, j.city, j.state, j.job_frequency, a.status "
+            "FROM job_applications a JOIN job_listings j ON j.id = a.job_id "
+            "WHERE a.user_id = ? ORDER BY a.created_at DESC",
+            (user_id,),
+        )
+
+    def list_for_parent(self, parent_email):
+        return self.db.fetch_all(
+            "SELECT a.id AS application_id, j.job_title, j.job_subject, u.full_name, a.resume_path, a.status "
+            "FROM job_applications a "
+            "JOIN job_listings j ON j.id = a.job_id "
+            "LEFT JOIN users u ON u.id = a.user_id "
+            "WHERE j.parent_email = ? ORDER BY a.id DESC",
+            (parent_email,),
+        )
+
+    def resume_paths(self):
+        """Every application's resume_path, i.e. the resume store references still in use."""
+        rows = self.db.fetch_all("SELECT resume_path FROM job_applications WHERE resume_path IS NOT NULL")
+        return [row["resume_path"] for row in rows]
+
+    def update_status(self, application_id, status):
+        with self.db.transaction() as tx:
+            updated, _ = tx.execute(
+                "UPDATE job_applications SET status = ?, updated_at = ? WHERE id = ?",
+                (status, _now(), application_id),
+            )
+            return updated > 0
+
+
+class SQLFeedback:
+    def __init__(self, db):
+        self.db = db
+
+    def page(self, before=None, limit=10):
+        """Newest-first feedback after the (created_at, id) cursor of the previous page."""
+        sql = "SELECT id, full_name, rating, comment, created_at FROM feedback"
+        args = []
+        if before is not None:
+            sql += " WHERE created_at < ? OR (created_at = ? AND id < ?)"
+            args = [before[0], before[0], before[1]]
+        return self.db.fetch_all(sql + " ORDER BY created_at DESC, id DESC LIMIT ?", args + [limit])
+
+    def create(self, feedback):
+        with self.db.transaction() as tx:
+            _, feedback_id = tx.execute(
+                f"INSERT INTO feedback ({', '.join(feedback)}) VALUES ({_placeholders(feedback)})", feedback.values()
+            )
+            return {**feedback, "id": feedback_id}
+
+    def rating_counts(self):
+        rows = self.db.fetch_all("SELECT rating, COUNT(*) AS n FROM feedback GROUP BY rating")
+        return {row["rating"]: row["n"] for row in rows}
+
+
+class SQLUserData:
+    def __init__(self, db):
+        self.db = db
+
+    def insert(self, record):
+        with self.db.transaction() as tx:
+            tx.execute(f"INSERT INTO user_data ({', '.join(record)}) VALUES ({_placeholders(record)})", record.values())
+
+
+# Supabase backend
+
+class SupabaseUsers:
+    def __init__(self, client):
+        self.client = client
+
+    def get_by_email(self, email):
+        response = self.client.table("users").select("*").eq("email", email).limit(1).execute()
+        return response.data[0] if response.data else None
+
+    def get_by_username(self, username):
+        response = self.client.table("users").select("*").eq("username", username).limit(1).execute()
+        return response.data[0] if response.data else None
+
+    def authenticate(self, email, password):
+        response = self.client.table("users").select("id").eq("email", email).eq("password", password).limit(1).execute()
+        return response.data[0]["id"] if response.data else None
+
+    def create(self, user):
+        response = self.client.table("users").insert(user).execute()
+        return response.data[0] if response.data else None
+
+
+class SupabaseJobListings:
+    def __init__(self, client):
+        self.client = client
+
+    def list_for_index(self, after_id=None, job_ids=None):
+        query = self.client.table("job_listings").select(", ".join(JOB_INDEX_COLUMNS)).eq("is_active", True)
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        if job_ids is not None:
+            job_ids = list(job_ids)
+            if not job_ids:
+                return []
+            query = query.in_("id", job_ids)
+        return query.order("id").execute().data or []
+
+    def find_by_title(self, job_title):
+        return self.client.table("job_listings").select("id, job_title, city, state").eq("job_title", job_title).execute().data or []
+
+    def list_for_parent(self, parent_email):
+        rows = (
+            self.client.table("job_listings")
+            .select("id, job_title, job_description, is_active")
+            .eq("parent_email", parent_email)
+            .order("id", desc=True)
+            .execute()
+        ).data or []
+        for row in rows:
+            row["job_description"] = (row.get("job_description") or "")[:LISTING_DESCRIPTION_CHARS]
+        return rows
+
+    def create(self, listing):
+        response = self.client.table("job_listings").insert(listing).execute()
+        return response.data[0] if response.data else None
+
+    def set_active(self, job_ids, is_active, parent_email):
+        (self.client.table("job_listings").update({"is_active": is_active})
+         .in_("id", list(job_ids)).eq("parent_email", parent_email).execute())
+
+    def delete(self, job_ids, parent_email):
+        self.client.table("job_listings").delete().in_("id", list(job_ids)).eq("parent_email", parent_email).execute()
+
+
+class SupabaseJobApplications:
+    # Stored procedure defined in sql/submit_application.sql
+    SUBMIT_FUNCTION = "submit_application"
+
+    def __init__(self, client):
+        self.client = client
+
+    def submit(self, user_id, job_id, resume_path, teaching_style, availability):
+        """One rpc call; uniqueness is enforced by Postgres. Same contract as SQLJobApplications.submit."""
+        response = self.client.rpc(self.SUBMIT_FUNCTION, {
+            "p_user_id": user_id,
+            "p_job_id": job_id,
+            "p_resume_path": resume_path,
+            "p_teaching_style": teaching_style,
+            "p_availability": availability,
+        }).execute()
+        if not response.data:
+            return None, False
+        application = dict(response.data[0])
+        return application, application.pop("created")
+
+    def list_for_user(self, user_id):
+        return self.client.rpc("get_applied_jobs", {"user_id_param": user_id}).execute().data or []
+
+    def list_for_parent(self, parent_email):
+        rows = (
+            self.client.table("job_applications")
+            .select("application_id:id, job_listings!inner(job_title, job_subject), users(full_name), resume_path, status")
+            .eq("job_listings.parent_email", parent_email)
+            .order("id", desc=True)
+            .execute()
+        ).data or []
+        return [{
+            "application_id": row["application_id"],
+            "job_title": row["job_listings"]["job_title"],
+            "job_subject": row["job_listings"]["job_subject"],
+            "full_name": (row.get("users") or {}).get("full_name"),
+            "resume_path": row.get("resume_path"),
+            "status": row.get("status"),
+        } for row in rows]
+
+    def resume_paths(self, page_size=1000):
+        """Every application's resume_path, i.e. the resume store references still in use."""
+        # Keyset pages: PostgREST caps how many rows one request returns
+        paths, last_id = [], 0
+        while True:
+            rows = (
+                self.client.table("job_applications")
+                .select("id, resume_path")
+                .gt("id", last_id)
+                .order("id")
+                .limit(page_size)
+                .execute()
+            ).data or []
+            paths.extend(row["resume_path"] for row in rows if row.get("resume_path"))
+            if len(rows) < page_size:
+                return paths
+            last_id = rows[-1]["id"]
+
+    def update_status(self, application_id, status):
+        response = (
+            self.client.table("job_applications")
+            .update({"status": status, "updated_at": _now()})
+            .eq("id", application_id)
+            .execute()
+        )
+        return bool(response.data)
+
+
+class SupabaseFeedback:
+    def __init__(self, client):
+        self.client = client
+
+    def page(self, before=None, limit=10):
+        query = self.client.table("feedback").select("id, full_name, rating, comment, created_at")
+        if before is not None:
+            created_at, feedback_id = before
+            # Rows sharing the cursor's created_at are split by id, so none are skipped or repeated
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{feedback_id})')
+        return query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute().data or []
+
+    def create(self, feedback):
+        response = self.client.table("feedback").insert(feedback).execute()
+        return response.data[0] if response.data else None
+
+    def rating_counts(self):
+        counts = {}
+        for rating in range(1, 6):
+            response = self.client.table("feedback").select("id", count="exact", head=True).eq("rating", rating).execute()
+            counts[rating] = response.count or 0
+        return counts
+
+
+class SupabaseUserData:
+    def __init__(self, client):
+        self.client = client
+
+    def insert(self, record):
+        self.client.table("user_data").insert(record).execute()
+
+
+class Repositories:
+    """The per-table repositories of one backend."""
+
+    def __init__(self, backend, users, job_listings, job_applications, feedback, user_data):
+        self.backend = backend
+        self.users = users
+        self.job_listings = job_listings
+        self.job_applications = job_applications
+        self.feedback = feedback
+        self.user_data = user_data
+
+
+def create_repositories(backend, **options):
+    """Build the repositories for "supabase", "mysql" or "sqlite" (options go to the SQL backend)."""
+    if backend == "supabase":
+        from db_client import get_supabase
+
+        client = options.get("client") or get_supabase()
+        return Repositories(backend, SupabaseUsers(client), SupabaseJobListings(client),
+                            SupabaseJobApplications(client), SupabaseFeedback(client), SupabaseUserData(client))
+    if backend == "sqlite":
+        db = SQLiteBackend(**options)
+    elif backend == "mysql":
+        db = MySQLBackend(**options)
+    else:
+        raise ValueError(f"Unknown data backend: {backend!r}")
+    return Repositories(backend, SQLUsers(db), SQLJobListings(db), SQLJobApplications(db),
+                        SQLFeedback(db), SQLUserData(db))
+
+
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+
+def get_repositories(backend=None):
+    """Return the process-wide repositories for a backend (DATA_BACKEND by default)."""
+    backend = backend or DATA_BACKEND
+    with _repositories_lock:
+        if backend not in _repositories:
+            _repositories[backend] = create_repositories(backend)
+        return _repositories[backend]
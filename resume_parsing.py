@@ -0,0 +1,96 @@
+from pyresparser import utils
+
+from nlp_pipeline import get_custom_nlp, get_name_matcher, get_nlp, get_skills, pipe, pipe_custom
+
+
+def _extract_name(nlp_text):
+    """Find the first pair of proper nouns that does not look like a 'Name' label."""
+    for _, start, end in get_name_matcher()(nlp_text):
+        span = nlp_text[start:end]
+        if 'name' not in span.text.lower():
+            return span.text
+    return None
+
+
+def _extract_skills(nlp_text, noun_chunks, skills_file=None):
+    """pyresparser's skill matching, without re-reading skills.csv for every resume."""
+    if skills_file:
+        return utils.extract_skills(nlp_text, noun_chunks, skills_file)
+    skills = get_skills()
+    skillset = [token.text for token in nlp_text if not token.is_stop and token.text.lower() in skills]
+    for chunk in noun_chunks:
+        chunk_text = chunk.text.lower().strip()
+        if chunk_text in skills:
+            skillset.append(chunk_text)
+    return [i.capitalize() for i in set([i.lower() for i in skillset])]
+
+
+def _resume_texts(extraction):
+    # pyresparser prefixes every page with a space before joining them
+    text_raw = ''.join(' ' + page for page in extraction.pages)
+    return text_raw, ' '.join(text_raw.split())
+
+
+def _details(extraction, text_raw, text, nlp_text, custom_nlp_text, skills_file=None, custom_regex=None):
+    noun_chunks = list(nlp_text.noun_chunks)
+    details = {
+        'name': None,
+        'email': None,
+        'mobile_number': None,
+        'skills': None,
+        'college_name': None,
+        'degree': None,
+        'designation': None,
+        'experience': None,
+        'company_names': None,
+        'no_of_pages': extraction.page_count,
+        'total_experience': 0,
+    }
+
+    cust_ent = utils.extract_entities_wih_custom_model(custom_nlp_text)
+    entities = utils.extract_entity_sections_grad(text_raw)
+
+    try:
+        details['name'] = cust_ent['Name'][0]
+    except (IndexError, KeyError):
+        details['name'] = _extract_name(nlp_text)
+
+    details['email'] = utils.extract_email(text)
+    details['mobile_number'] = utils.extract_mobile_number(text, custom_regex)
+    details['skills'] = _extract_skills(nlp_text, noun_chunks, skills_file)
+    details['college_name'] = entities.get('College Name')
+    details['degree'] = cust_ent.get('Degree')
+    details['designation'] = cust_ent.get('Designation')
+    details['company_names'] = cust_ent.get('Companies worked at')
+
+    if 'experience' in entities:
+        details['experience'] = entities['experience']
+        try:
+            details['total_experience'] = round(utils.get_total_experience(entities['experience']) / 12, 2)
+        except KeyError:
+            details['total_experience'] = 0
+
+    return details
+
+
+def parse_resume(extraction, skills_file=None, custom_regex=None):
+    """
+    Extract the same details as pyresparser's ResumeParser, but from an
+    already extracted PDF and with the process-wide spaCy models.
+    """
+    text_raw, text = _resume_texts(extraction)
+    nlp_text = get_nlp()(text)
+    custom_nlp_text = get_custom_nlp()(text_raw)
+    return _details(extraction, text_raw, text, nlp_text, custom_nlp_text, skills_file, custom_regex)
+
+
+def parse_resumes(extractions, batch_size=16, skills_file=None, custom_regex=None):
+    """Parse many extracted resumes, batching them through nlp.pipe."""
+    extractions = list(extractions)
+    texts = [_resume_texts(extraction) for extraction in extractions]
+    nlp_docs = pipe((text for _, text in texts), batch_size=batch_size)
+    custom_docs = pipe_custom((text_raw for text_raw, _ in texts), batch_size=batch_size)
+    return [
+        _details(extraction, text_raw, text, nlp_text, custom_nlp_text, skills_file, custom_regex)
+        for extraction, (text_raw, text), nlp_text, custom_nlp_text in zip(extractions, texts, nlp_docs, custom_docs)
+    ]
@@ -0,0 +1,69 @@
+from keyword_matcher import get_keyword_matcher
+
+# (taxonomy in keywords.TAXONOMIES, field name, skills we recommend for that field), checked in order
+FIELD_RULES = [
+    ('it', 'Information Technology', ['Database Management', 'Digital Pedagogy', 'System Administration']),
+    ('software', 'Software Engineering', ['React', 'Usability Testing', 'Node JS']),
+    ('multimedia', 'Multimedia', ['Motion Graphics', 'Blender', 'User Interface Design']),
+    ('science', 'Science', ['Electrochemistry', 'Biodiversity', 'Science Experiments']),
+    ('math', 'Mathematics', ['Visual Learning in Math', 'Hands-on Math Activities', 'Inquiry-based Learning in Math']),
+    ('special_education', 'Special Education', ['Sign Language', 'Braille', 'Teaching Special Needs Students']),
+    ('early_childhood', 'Early Childhood Education', ['Play-Based Learning', 'Montessori', 'Sensory Play']),
+    ('history', 'History', ['Artifact Analysis', 'Historical Essay Writing', 'Archaeology Basics']),
+    ('geography', 'Geography', ['GIS Software', 'Remote Sensing Techniques', 'Spatial Thinking']),
+    ('economics', 'Economics', ['Economic Forecasting', 'Cost-Benefit Analysis', 'Market Research']),
+]
+
+# (section, words that count as having it, points)
+SCORE_RULES = [
+    ('Objective', ('Objective',), 20),
+    ('Declaration', ('Declaration',), 20),
+    ('Hobbies', ('Hobbies', 'Interests'), 20),
+    ('Achievements', ('Achievements',), 20),
+    ('Projects', ('Projects',), 20),
+]
+
+
+def classify_field(skills, resume_text=None):
+    """
+    Return (field, recommended skills) for the first skill found in a field
+    taxonomy. If no skill matches, fall back to the field with the most
+    keyword hits in the resume text.
+    """
+    matcher = get_keyword_matcher()
+    for skill in skills or []:
+        categories = matcher.categories_for(skill)
+        for taxonomy, field, recommended_skills in FIELD_RULES:
+            if taxonomy in categories:
+                return field, list(recommended_skills)
+
+    if resume_text:
+        counts = matcher.scan(resume_text)["counts"]
+        # max() keeps the first of equal counts, so ties go to the field listed first
+        taxonomy, field, recommended_skills = max(FIELD_RULES, key=lambda rule: counts.get(rule[0], 0))
+        if counts.get(taxonomy):
+            return field, list(recommended_skills)
+    return '', []
+
+
+def candidate_level(no_of_pages, skill_count):
+    """Classify the candidate as Fresher, Intermediate or Experienced."""
+    if no_of_pages == 1 and skill_count < 3:
+        return "Fresher"
+    if no_of_pages == 2 or (no_of_pages == 1 and skill_count >= 3):
+        return "Intermediate"
+    if no_of_pages is not None and no_of_pages >= 3:
+        return "Experienced"
+    return ''
+
+
+def score_resume(resume_text):
+    """Return the resume writing score and which scored sections were found."""
+    score = 0
+    sections = {}
+    for section, words, points in SCORE_RULES:
+        found = any(word in resume_text for word in words)
+        sections[section] = found
+        if found:
+            score += points
+    return score, sections
@@ -0,0 +1,299 @@
+"""
+Content-addressed storage for uploaded resumes.
+
+put() streams an upload to disk in RESUME_STORE_CHUNK_SIZE chunks while
+hashing it, and files it under its SHA-256, so the same PDF uploaded twice
+(or re-saved on every rerun) is stored once. It returns a reference of the
+form "sha256:<hex>", which is what job applications keep in resume_path.
+With RESUME_STORE_COMPRESSION=gzip blobs are gzipped on the way in and
+transparently decompressed by open().
+
+Every blob has a reference count in an SQLite index next to the blobs:
+submitting an application takes a reference. gc() deletes blobs nobody
+references once they have not been uploaded again for
+RESUME_STORE_GC_GRACE seconds (a resume that is only being checked or is
+still being applied with keeps no reference).
+
+The reference is taken after the application is committed in the app's
+database, so a crash in between, or an application deleted there, leaves
+the counts wrong. The gc command therefore first recounts them from
+job_applications.resume_path (mark and sweep); gc() without live refs
+trusts the counts.
+
+    python resume_store.py gc
+
+LocalResumeStore is the filesystem backend; another backend (a blob store)
+only needs the same methods.
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+RESUME_STORE_BACKEND = os.environ.get("RESUME_STORE_BACKEND", "local")
+RESUME_STORE_DIR = os.environ.get("RESUME_STORE_DIR", "./resume_store")
+RESUME_STORE_COMPRESSION = os.environ.get("RESUME_STORE_COMPRESSION", "none")   # "none" or "gzip"
+RESUME_STORE_CHUNK_SIZE = 256 * 1024
+RESUME_STORE_GC_GRACE = int(os.environ.get("RESUME_STORE_GC_GRACE", 7 * 24 * 60 * 60))
+REF_PREFIX = "sha256:"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    compression TEXT NOT NULL,
+    refs INTEGER NOT NULL DEFAULT 0,
+    last_put REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_unreferenced ON blobs (refs, last_put);
+"""
+
+
+def is_ref(value):
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def _digest(ref):
+    if not is_ref(ref):
+        raise ValueError(f"Not a resume store reference: {ref!r}")
+    digest = ref[len(REF_PREFIX):]
+    if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+        raise ValueError(f"Not a resume store reference: {ref!r}")
+    return digest
+
+
+class LocalResumeStore:
+    """Blobs under root/<first two hex digits>/<digest>.pdf[.gz], with an SQLite reference index."""
+
+    def __init__(self, root=RESUME_STORE_DIR, compression=RESUME_STORE_COMPRESSION,
+                 chunk_size=RESUME_STORE_CHUNK_SIZE):
+        if compression not in ("none", "gzip"):
+            raise ValueError(f"Unknown resume store compression: {compression!r}")
+        self.root = root
+        self.compression = compression
+        self.chunk_size = chunk_size
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False,
+                                      isolation_level=None, timeout=30)
+        self._index.executescript(INDEX_SCHEMA)
+
+    def _path(self, digest, compression):
+        suffix = ".pdf.gz" if compression == "gzip" else ".pdf"
+        return os.path.join(self.root, digest[:2], digest + suffix)
+
+    @contextmanager
+    def _exclusive(self):
+        """One write transaction on the index; it also excludes other processes (e.g. a gc run)."""
+        with self._lock:
+            self._index.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._index
+            except BaseException:
+                self._index.execute("ROLLBACK")
+                raise
+            self._index.execute("COMMIT")
+
+    def _row(self, digest):
+        with self._lock:
+            return self._index.execute(
+                "SELECT size, stored_size, compression, refs FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+
+    def put(self, source):
+        """
+        Store a bytes-like buffer (written in slices, without copying it) or a
+        binary file object (read in chunks from the start); return its reference.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source).cast("B")
+            chunks = (view[offset:offset + self.chunk_size] for offset in range(0, len(view), self.chunk_size))
+        else:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            chunks = iter(lambda: source.read(self.chunk_size), b"")
+        tmp_path = os.path.join(self.root, f"upload.{os.getpid()}.{threading.get_ident()}.tmp")
+        sha = hashlib.sha256()
+        size = 0
+        with open(tmp_path, "wb") as raw:
+            out = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) if self.compression == "gzip" else raw
+            try:
+                for chunk in chunks:
+                    sha.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            finally:
+                if out is not raw:
+                    out.close()
+        digest = sha.hexdigest()
+
+        # Check, file and touch in one step, so gc() cannot delete the blob in between
+        with self._exclusive() as index:
+            existing = index.execute("SELECT compression FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if existing and os.path.exists(self._path(digest, existing[0])):
+                # Already stored: keep the first copy
+                os.remove(tmp_path)
+                index.execute("UPDATE blobs SET last_put = ? WHERE digest = ?", (time.time(), digest))
+            else:
+                path = self._path(digest, self.compression)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                stored_size = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+                index.execute(
+                    "INSERT INTO blobs (digest, size, stored_size, compression, last_put) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(digest) DO UPDATE SET stored_size = excluded.stored_size, "
+                    "compression = excluded.compression, last_put = excluded.last_put",
+                    (digest, size, stored_size, self.compression, time.time()),
+                )
+        return REF_PREFIX + digest
+
+    def exists(self, ref):
+        row = self._row(_digest(ref))
+        return row is not None and os.path.exists(self._path(_digest(ref), row[2]))
+
+    def size(self, ref):
+        """Uncompressed size in bytes."""
+        row = self._row(_digest(ref))
+        if row is None:
+            raise FileNotFoundError(ref)
+        return row[0]
+
+    def open(self, ref):
+        """A binary file object with the original (decompressed) contents."""
+        digest = _digest(ref)
+        row = self._row(digest)
+        if row is None:
+            raise FileNotFoundError(ref)
+        path = self._path(digest, row[2])
+        return gzip.open(path, "rb") if row[2] == "gzip" else open(path, "rb")
+
+    def local_path(self, ref):
+        """Path of the uncompressed blob on disk, or None when it is stored compressed."""
+        digest = _digest(ref)
+        row = self._row(digest)
+        if row is None or row[2] != "none":
+            return None
+        return self._path(digest, "none")
+
+    def incref(self, ref):
+        with self._lock:
+            self._index.execute("UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (_digest(ref),))
+
+    def decref(self, ref):
+        with self._lock:
+            self._index.execute("UPDATE blobs SET refs = MAX(refs - 1, 0) WHERE digest = ?", (_digest(ref),))
+
+    def recount(self, live_refs):
+        """Reset every reference count to the number of times it occurs in live_refs."""
+        counts = Counter(_digest(ref) for ref in live_refs if is_ref(ref))
+        with self._exclusive() as index:
+            index.execute("UPDATE blobs SET refs = 0")
+            index.executemany("UPDATE blobs SET refs = ? WHERE digest = ?",
+                              [(refs, digest) for digest, refs in counts.items()])
+
+    def gc(self, grace=RESUME_STORE_GC_GRACE, live_refs=None):
+        """
+        Delete unreferenced blobs not uploaded again within grace seconds; return
+        how many. With live_refs (every resume_path in use) the counts are
+        recounted first. An application submitted while its refs were being
+        listed is not lost: its blob was uploaded within the grace period.
+        """
+        if live_refs is not None:
+            self.recount(live_refs)
+        cutoff = time.time() - grace
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT digest, compression FROM blobs WHERE refs = 0 AND last_put < ?", (cutoff,)
+            ).fetchall()
+        removed = 0
+        for digest, compression in rows:
+            with self._exclusive() as index:
+                # Re-check: an application may have taken a reference, or put() stored it again, meanwhile
+                deleted = index.execute(
+                    "DELETE FROM blobs WHERE digest = ? AND refs = 0 AND last_put < ?", (digest, cutoff)
+                ).rowcount
+                if deleted:
+                    try:
+                        os.remove(self._path(digest, compression))
+                    except OSError:
+                        pass
+            removed += deleted
+        return removed
+
+    def stats(self):
+        with self._lock:
+            blobs, size, stored, unreferenced = self._index.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0), "
+                "COALESCE(SUM(refs = 0), 0) FROM blobs"
+            ).fetchone()
+        return {"blobs": blobs, "bytes": size, "stored_bytes": stored, "unreferenced": unreferenced}
+
+
+def create_resume_store(backend, **options):
+    """Build the resume store for a backend ("local")."""
+    if backend == "local":
+        return LocalResumeStore(**options)
+    raise ValueError(f"Unknown resume store backend: {backend!r}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_resume_store():
+    """Return the process-wide resume store (RESUME_STORE_BACKEND)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = create_resume_store(RESUME_STORE_BACKEND)
+        return _store
+
+
+def open_resume(resume_path):
+    """Open a stored resume by reference, or by file path for applications saved before the store."""
+    if is_ref(resume_path):
+        return get_resume_store().open(resume_path)
+    return open(resume_path, "rb")
+
+
+def resume_exists(resume_path):
+    if is_ref(resume_path):
+        return get_resume_store().exists(resume_path)
+    return bool(resume_path) and os.path.exists(resume_path)
+
+
+def read_resume(resume_path):
+    with open_resume(resume_path) as f:
+        return f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed resume store.")
+    parser.add_argument("command", choices=["gc", "stats"])
+    parser.add_argument("--grace", type=int, default=RESUME_STORE_GC_GRACE,
+                        help="seconds an unreferenced resume is kept after its last upload")
+    parser.add_argument("--trust-refcounts", action="store_true",
+                        help="skip recounting references from job_applications")
+    args = parser.parse_args(argv)
+
+    store = get_resume_store()
+    if args.command == "gc":
+        live_refs = None
+        if not args.trust_refcounts:
+            from repositories import get_repositories
+
+            live_refs = get_repositories().job_applications.resume_paths()
+        print(f"Removed {store.gc(args.grace, live_refs)} unreferenced resume(s)", file=sys.stderr)
+    print(store.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
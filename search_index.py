@@ -0,0 +1,134 @@
+import heapq
+import re
+import threading
+from collections import Counter, defaultdict
+
+# Searchable fields and how much a match in each counts towards relevance
+SEARCH_FIELDS = {
+    'job_title': 3.0,
+    'job_subject': 2.0,
+    'city': 1.5,
+    'state': 1.0,
+}
+
+# Share of a query word's trigrams a field must contain for the word to match it
+MIN_SIMILARITY = 0.5
+
+# Query words shorter than this are ignored: one letter shares a trigram with every word starting with it
+MIN_QUERY_WORD_LENGTH = 2
+
+# Letters and digits in any script, so accented names and cities are searchable
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def search_words(text):
+    """Lowercase alphanumeric words of a field or query."""
+    return WORD_PATTERN.findall((text or '').lower())
+
+
+def trigrams(word):
+    """pg_trgm-style trigrams of one word, padded so prefixes weigh more than suffixes."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Trigram index over the job listing fields the header search covers.
+
+    Trigrams point at the distinct words of each field rather than at
+    listings, so a query word is fuzzy-matched against the (slowly growing)
+    vocabulary and only then expanded to the listings using the matched
+    words. This tolerates typos and partial words, and listings are added or
+    removed one at a time as they change.
+    """
+
+    def __init__(self, fields=SEARCH_FIELDS, min_similarity=MIN_SIMILARITY):
+        self.fields = dict(fields)
+        self.min_similarity = min_similarity
+        self._lock = threading.RLock()
+        self._gram_words = defaultdict(set)   # trigram -> {(field, word)}
+        self._word_jobs = defaultdict(set)    # (field, word) -> {job id}
+        self._doc_words = {}                  # job id -> {(field, word)}
+
+    def __len__(self):
+        return len(self._doc_words)
+
+    def upsert(self, job):
+        """Index a listing, replacing any earlier version of it."""
+        with self._lock:
+            self._remove(job['id'])
+            entries = {(field, word) for field in self.fields for word in search_words(job.get(field))}
+            for entry in entries:
+                if entry not in self._word_jobs:
+                    for gram in trigrams(entry[1]):
+                        self._gram_words[gram].add(entry)
+                self._word_jobs[entry].add(job['id'])
+            self._doc_words[job['id']] = entries
+
+    def _remove(self, job_id):
+        for entry in self._doc_words.pop(job_id, ()):
+            jobs = self._word_jobs.get(entry)
+            if jobs is None:
+                continue
+            jobs.discard(job_id)
+            if not jobs:
+                del self._word_jobs[entry]
+                for gram in trigrams(entry[1]):
+                    words = self._gram_words.get(gram)
+                    if words is not None:
+                        words.discard(entry)
+                        if not words:
+                            del self._gram_words[gram]
+
+    def remove(self, job_id):
+        """Drop a listing from the index."""
+        with self._lock:
+            self._remove(job_id)
+
+    def build(self, jobs):
+        """Replace every listing at once."""
+        with self._lock:
+            self._gram_words.clear()
+            self._word_jobs.clear()
+            self._doc_words.clear()
+            for job in jobs:
+                self.upsert(job)
+
+    def _similar_words(self, word, fields):
+        # (weighted similarity, field, word) for vocabulary words close enough to the query word
+        word_grams = trigrams(word)
+        shared = Counter()
+        for gram in word_grams:
+            shared.update(entry for entry in self._gram_words.get(gram, ()) if entry[0] in fields)
+        matches = []
+        for (field, vocab_word), count in shared.items():
+            similarity = count / len(word_grams)
+            if similarity >= self.min_similarity:
+                matches.append((similarity * self.fields[field], field, vocab_word))
+        return sorted(matches, reverse=True)
+
+    def search(self, query, fields=None, limit=50):
+        """
+        Return up to limit (job id, score) pairs, best first. Listings matching
+        more of the query words rank first, then by similarity weighted by field.
+        """
+        fields = {field for field in (fields or self.fields) if field in self.fields}
+        words = [word for word in dict.fromkeys(search_words(query)) if len(word) >= MIN_QUERY_WORD_LENGTH]
+        if not words or not fields:
+            return []
+
+        with self._lock:
+            matched_words = Counter()
+            scores = Counter()
+            for word in words:
+                # Walk matches best first, so each listing keeps its best field for this word
+                best = {}
+                for weighted, field, vocab_word in self._similar_words(word, fields):
+                    jobs = self._word_jobs[field, vocab_word]
+                    best.update(dict.fromkeys(jobs.difference(best), weighted))
+                matched_words.update(best.keys())
+                scores.update(best)
+
+        ranked = heapq.nsmallest(limit, scores, key=lambda job_id: (-matched_words[job_id], -scores[job_id], str(job_id)))
+        return [(job_id, scores[job_id]) for job_id in ranked]
@@ -0,0 +1,234 @@
+"""
+Per-session memory accounting and budgets.
+
+After each rerun app_test calls enforce_budget() for the session. It
+estimates the session's footprint as a sizeof walk over st.session_state,
+plus the bytes of its uploaded files and of the media (downloads, images)
+Streamlit holds for it. The footprint is recorded in a process-wide
+tracker. When a session is over SESSION_MEMORY_BUDGET_MB, entries that
+pages marked evictable are dropped, largest first: recomputable caches and
+the flags that keep resume downloads rendered (whose media Streamlit then
+frees). If that is not enough, the session's uploaded files are released
+and its uploaders come back empty. While all sessions together exceed
+PROCESS_MEMORY_BUDGET_MB, each session's budget shrinks to its fair share.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+SESSION_MEMORY_BUDGET_MB = float(os.environ.get("SESSION_MEMORY_BUDGET_MB", 64))
+PROCESS_MEMORY_BUDGET_MB = float(os.environ.get("PROCESS_MEMORY_BUDGET_MB", 1024))
+SESSION_STALE_AFTER = 60 * 60   # seconds without a rerun before a session drops out of the totals
+MAX_SIZEOF_DEPTH = 8
+EVICTABLE_KEY = "_evictable_keys"
+# Set when the budget dropped the session's uploads, so the page can ask for them again
+UPLOADS_RELEASED_KEY = "_uploads_released"
+UPLOADS = "(uploaded files)"
+MEDIA = "(media files)"
+
+logger = logging.getLogger(__name__)
+
+
+def deep_sizeof(obj, _seen=None, _depth=0):
+    """Approximate bytes held by obj and everything it references (shared objects counted once)."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen or _depth > MAX_SIZEOF_DEPTH:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, memoryview):
+        return sys.getsizeof(obj) + obj.nbytes
+    if hasattr(obj, "getvalue") and hasattr(obj, "seek") and not isinstance(obj, type):
+        # BytesIO and Streamlit's UploadedFile. getvalue() returns the bytes an UploadedFile
+        # shares with Streamlit, where getbuffer() would first copy them
+        try:
+            return sys.getsizeof(obj) + len(obj.getvalue())
+        except (TypeError, ValueError):
+            pass
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):
+        # pandas DataFrame
+        try:
+            return int(obj.memory_usage(deep=True).sum())
+        except Exception:
+            pass
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, _seen, _depth + 1) + deep_sizeof(v, _seen, _depth + 1)
+                          for k, v in list(obj.items()))
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(item, _seen, _depth + 1) for item in list(obj))
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), _seen, _depth + 1)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), _seen, _depth + 1)
+    return size
+
+
+def session_breakdown(session_state):
+    """Bytes per st.session_state key (widget values included)."""
+    seen = set()
+    return {key: deep_sizeof(value, seen) for key, value in session_state.to_dict().items()}
+
+
+def _runtime():
+    from streamlit.runtime import Runtime
+
+    return Runtime.instance() if Runtime.exists() else None
+
+
+def uploaded_file_bytes(session_id):
+    """Bytes of the files this session has uploaded and Streamlit still holds in memory."""
+    runtime = _runtime()
+    storage = getattr(getattr(runtime, "uploaded_file_mgr", None), "file_storage", None)
+    if not storage:
+        return 0
+    return sum(len(record.data) for record in list(storage.get(session_id, {}).values()))
+
+
+def media_file_bytes(session_id):
+    """Bytes of the media (download buttons, images) Streamlit holds for this session."""
+    runtime = _runtime()
+    manager = getattr(runtime, "media_file_mgr", None)
+    try:
+        file_ids = set(manager._files_by_session_and_coord.get(session_id, {}).values())
+        files = manager._storage._files_by_id
+        return sum(len(files[file_id].content) for file_id in file_ids if file_id in files)
+    except AttributeError:
+        # Not the in-memory storage, or Streamlit's internals moved
+        return 0
+
+
+class SessionMemoryTracker:
+    """Latest footprint of every active session in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._reports = {}
+
+    def record(self, session_id, total_bytes, breakdown=None, evicted=()):
+        with self._lock:
+            self._sessions[session_id] = (total_bytes, time.time())
+            self._reports[session_id] = (total_bytes, dict(breakdown or {}), list(evicted))
+
+    def report(self, session_id):
+        """(total bytes, breakdown, evicted) from the session's last accounting, or None."""
+        with self._lock:
+            return self._reports.get(session_id)
+
+    def _prune(self):
+        cutoff = time.time() - SESSION_STALE_AFTER
+        for session_id in [s for s, (_, seen_at) in self._sessions.items() if seen_at < cutoff]:
+            del self._sessions[session_id]
+            self._reports.pop(session_id, None)
+
+    def totals(self, top_n=5):
+        with self._lock:
+            self._prune()
+            sessions = {session_id: size for session_id, (size, _) in self._sessions.items()}
+        largest = sorted(sessions.items(), key=lambda item: item[1], reverse=True)[:top_n]
+        return {
+            "sessions": len(sessions),
+            "total_bytes": sum(sessions.values()),
+            "largest": [(session_id[:8], size) for session_id, size in largest],
+        }
+
+    def budget_for_session(self):
+        """The per-session budget, cut to a fair share while the process total is over its budget."""
+        budget = SESSION_MEMORY_BUDGET_MB * 1024 * 1024
+        totals = self.totals(top_n=0)
+        process_budget = PROCESS_MEMORY_BUDGET_MB * 1024 * 1024
+        if totals["sessions"] and totals["total_bytes"] > process_budget:
+            budget = min(budget, process_budget / totals["sessions"])
+        return budget
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_memory_tracker():
+    """Return the process-wide session memory tracker."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = SessionMemoryTracker()
+        return _tracker
+
+
+def mark_evictable(session_state, key, frees=None):
+    """
+    Allow the budget to drop session_state[key]; the page must rebuild it when
+    it is missing. frees names the breakdown bucket ("(media files)") that
+    dropping the key releases on the next rerun, e.g. a flag that renders a
+    download button.
+    """
+    session_state.setdefault(EVICTABLE_KEY, {})[key] = frees
+
+
+def release_uploads(session_id):
+    """Drop the session's uploaded files from Streamlit's memory; their uploaders come back empty."""
+    runtime = _runtime()
+    manager = getattr(runtime, "uploaded_file_mgr", None)
+    storage = getattr(manager, "file_storage", None)
+    if not storage or session_id not in storage:
+        return 0
+    released = 0
+    for file_id, record in list(storage[session_id].items()):
+        released += len(record.data)
+        manager.remove_file(session_id, file_id)
+    return released
+
+
+def enforce_budget(session_state, session_id):
+    """
+    Account for this session and reclaim memory while it is over budget:
+    first the evictable entries, largest first (counting what they free),
+    then, as a last resort, the session's uploaded files. Returns
+    (footprint in bytes, breakdown, what was evicted).
+    """
+    tracker = get_memory_tracker()
+    breakdown = session_breakdown(session_state)
+    breakdown[UPLOADS] = uploaded_file_bytes(session_id)
+    breakdown[MEDIA] = media_file_bytes(session_id)
+    total = sum(breakdown.values())
+
+    budget = tracker.budget_for_session()
+    evicted = []
+    evictable = session_state.get(EVICTABLE_KEY, {})
+    for key in [k for k in evictable if k not in breakdown]:
+        del evictable[key]   # already removed by the page
+
+    def reclaimable(key):
+        return breakdown.get(key, 0) + breakdown.get(evictable[key], 0)
+
+    for key in sorted((k for k in evictable if k in breakdown), key=reclaimable, reverse=True):
+        if total <= budget:
+            break
+        total -= reclaimable(key)
+        breakdown.pop(key)
+        bucket = evictable.pop(key)
+        if bucket in breakdown:
+            breakdown[bucket] = 0   # released once the next rerun stops rendering it
+        del session_state[key]
+        evicted.append(key)
+    if total > budget and breakdown[UPLOADS]:
+        total -= release_uploads(session_id)
+        breakdown[UPLOADS] = 0
+        session_state[UPLOADS_RELEASED_KEY] = True
+        evicted.append(UPLOADS)
+    if total > budget:
+        logger.warning("Session %s holds %.1f MB, over its %.1f MB budget, with nothing left to evict",
+                       session_id[:8], total / 1024 / 1024, budget / 1024 / 1024)
+    elif evicted:
+        logger.info("Session %s evicted %s to stay within %.1f MB", session_id[:8], evicted, budget / 1024 / 1024)
+
+    tracker.record(session_id, total, breakdown, evicted)
+    return total, breakdown, evicted
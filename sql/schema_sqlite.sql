@@ -0,0 +1,78 @@
+-- Embedded SQLite schema used by repositories.SQLiteBackend.
+-- Mirrors the Supabase tables the app uses, with the indexes its queries need.
+
+create table if not exists users (
+    id integer primary key autoincrement,
+    email text not null unique,
+    username text unique,
+    full_name text,
+    password text,
+    user_type text,
+    created_at text default current_timestamp
+);
+
+create table if not exists job_listings (
+    id integer primary key autoincrement,
+    parent_email text not null,
+    full_name text,
+    phone_number text,
+    city text,
+    state text,
+    detailed_address text,
+    preferred_contact text,
+    job_title text not null,
+    job_description text,
+    preferred_start_date text,
+    job_frequency text,
+    required_skills text,
+    educational_background text,
+    age_range text,
+    hourly_rate real,
+    rate_negotiable integer,
+    job_subject text,
+    special_conditions text,
+    is_active integer not null default 1,
+    created_at text default current_timestamp
+);
+create index if not exists job_listings_parent_email_idx on job_listings (parent_email, id desc);
+create index if not exists job_listings_job_title_idx on job_listings (job_title);
+
+create table if not exists job_applications (
+    id integer primary key autoincrement,
+    user_id integer not null references users (id),
+    job_id integer not null references job_listings (id) on delete cascade,
+    resume_path text,
+    teaching_style text,
+    availability text,
+    is_confirmed integer not null default 0,
+    created_at text,
+    updated_at text,
+    status text not null default 'Pending',
+    unique (user_id, job_id)
+);
+create index if not exists job_applications_job_id_idx on job_applications (job_id);
+
+create table if not exists feedback (
+    id integer primary key autoincrement,
+    full_name text,
+    user_email text,
+    rating integer not null,
+    comment text,
+    created_at text not null
+);
+create index if not exists feedback_created_at_idx on feedback (created_at desc, id desc);
+create index if not exists feedback_rating_idx on feedback (rating);
+
+create table if not exists user_data (
+    id integer primary key autoincrement,
+    name text,
+    email text,
+    res_score real,
+    timestamp text,
+    no_of_pages integer,
+    reco_field text,
+    cand_level text,
+    skills text,
+    recommended_skills text
+);
+create index if not exists user_data_email_idx on user_data (email);
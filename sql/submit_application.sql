@@ -0,0 +1,70 @@
+-- One round trip, race-free job application submission.
+-- Run once in the Supabase SQL editor; apply.submit_application calls it via rpc().
+
+-- Earlier double-submits may have left duplicate (user_id, job_id) rows; keep the first of each
+-- so the unique constraint below can be added to a live table.
+delete from job_applications a
+using job_applications b
+where a.user_id = b.user_id
+  and a.job_id = b.job_id
+  and a.id > b.id;
+
+do $$
+begin
+    if not exists (select 1 from pg_constraint where conname = 'job_applications_user_job_key') then
+        alter table job_applications
+            add constraint job_applications_user_job_key unique (user_id, job_id);
+    end if;
+end;
+$$;
+
+create or replace function submit_application(
+    p_user_id bigint,
+    p_job_id bigint,
+    p_resume_path text,
+    p_teaching_style text,
+    p_availability text
+)
+returns table (
+    id bigint,
+    user_id bigint,
+    job_id bigint,
+    status text,
+    created_at timestamptz,
+    city text,
+    state text,
+    created boolean
+)
+language plpgsql
+as $$
+#variable_conflict use_column
+-- The output columns above are also variables in this body; use_column makes names in SQL mean the table columns
+declare
+    v_application job_applications%rowtype;
+    v_created boolean := false;
+begin
+    -- The unique constraint decides concurrent double-submits; the loser gets the existing row
+    insert into job_applications as a
+        (user_id, job_id, resume_path, teaching_style, availability, is_confirmed, created_at, status)
+    values
+        (p_user_id, p_job_id, p_resume_path, p_teaching_style, p_availability, false, now(), 'Pending')
+    on conflict on constraint job_applications_user_job_key do nothing
+    returning a.* into v_application;
+
+    if found then
+        v_created := true;
+    else
+        select a.* into v_application
+        from job_applications a
+        where a.user_id = p_user_id and a.job_id = p_job_id;
+    end if;
+
+    -- return query needs the declared types exactly; cast in case the table uses int, varchar or timestamp
+    return query
+    select v_application.id::bigint, v_application.user_id::bigint, v_application.job_id::bigint,
+           v_application.status::text, v_application.created_at::timestamptz,
+           j.city::text, j.state::text, v_created
+    from job_listings j
+    where j.id = p_job_id;
+end;
+$$;
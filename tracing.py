@@ -0,0 +1,245 @@
+"""
+Lightweight spans for seeing where a rerun's time goes.
+
+Each rerun of app_test.main is one trace. span() nests timed sections under
+the current one (tracked per script thread with contextvars); when the
+rerun's root span ends, the whole trace is appended to TRACE_FILE as one
+line of OTLP/JSON (an ExportTraceServiceRequest), which OpenTelemetry
+collectors and viewers can import. TRACE_SAMPLE_RATE of the reruns are
+written (the ?trace=1 panel shows every rerun either way), and the file is
+rotated at TRACE_FILE_MAX_MB, keeping TRACE_FILE_BACKUPS old files, so
+traces never take more than (backups + 1) x max MB of disk. Database spans
+slower than SLOW_QUERY_MS and page spans slower than SLOW_PAGE_MS are
+logged.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "1") != "0"
+TRACE_FILE = os.environ.get("TRACE_FILE", "./traces/spans.jsonl")
+TRACE_FILE_MAX_MB = float(os.environ.get("TRACE_FILE_MAX_MB", 50))
+TRACE_FILE_BACKUPS = int(os.environ.get("TRACE_FILE_BACKUPS", 3))
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", 1.0))
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 250))
+SLOW_PAGE_MS = float(os.environ.get("SLOW_PAGE_MS", 2000))
+SERVICE_NAME = "eduresume"
+
+# OTLP SpanKind values
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+logger = logging.getLogger(__name__)
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace", "name", "kind", "attributes", "span_id", "parent_id", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace, name, kind, attributes, parent_id):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS["client" if self.kind == "db" else "server" if self.kind == "rerun" else "internal"],
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in
+                           {"span.kind": self.kind, **self.attributes}.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Trace:
+    """The spans of one rerun, in the order they started."""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+
+    def breakdown(self):
+        """(depth, span) pairs in start order, for display."""
+        depth = {}
+        rows = []
+        for span in self.spans:
+            depth[span.span_id] = depth.get(span.parent_id, -1) + 1
+            rows.append((depth[span.span_id], span))
+        return rows
+
+    def to_otlp(self):
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in self.spans]}],
+        }]}
+
+
+class JsonlExporter:
+    """Appends finished traces to a file, one OTLP/JSON document per line, rotating it at max_bytes."""
+
+    def __init__(self, path=TRACE_FILE, max_bytes=TRACE_FILE_MAX_MB * 1024 * 1024, backups=TRACE_FILE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        # spans.jsonl -> spans.jsonl.1 -> ... -> spans.jsonl.<backups>, dropping the oldest
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def export(self, trace):
+        line = json.dumps(trace.to_otlp(), separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Return the process-wide trace exporter."""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = JsonlExporter()
+        return _exporter
+
+
+def _log_if_slow(span):
+    threshold = SLOW_QUERY_MS if span.kind == "db" else SLOW_PAGE_MS if span.kind == "page" else None
+    if threshold is not None and span.duration_ms > threshold:
+        label = "query" if span.kind == "db" else "page"
+        details = span.attributes.get("db.statement") or span.attributes.get("http.url") or ""
+        logger.warning("Slow %s (%.0f ms > %.0f ms): %s %s", label, span.duration_ms, threshold, span.name, details)
+
+
+@contextmanager
+def span(name, kind="internal", **attributes):
+    """
+    Time the block as a child of the current span. Outside a traced rerun
+    (tracing off, background threads, scripts) this is a no-op apart from
+    the slow-query log.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+    parent = _current_span.get()
+    trace = parent.trace if parent is not None else None
+    current = Span(trace, name, kind, attributes, parent.span_id if parent is not None else None)
+    if trace is not None:
+        trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        _log_if_slow(current)
+
+
+@contextmanager
+def trace_rerun(name="rerun", **attributes):
+    """Start a new trace for one rerun and export it when the block ends."""
+    if not TRACING_ENABLED:
+        yield None
+        return
+    trace = Trace()
+    root = Span(trace, name, "rerun", attributes, None)
+    trace.spans.append(root)
+    token = _current_span.set(root)
+    try:
+        yield trace
+    except BaseException as e:
+        # st.rerun()/st.stop() end a run by raising; the trace is still complete
+        if type(e).__name__ not in ("RerunException", "StopException"):
+            root.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _current_span.reset(token)
+        _log_if_slow(root)
+        if random.random() < TRACE_SAMPLE_RATE:
+            try:
+                get_exporter().export(trace)
+            except OSError as e:
+                logger.warning("Could not export trace: %s", e)
+
+
+def record_span(name, start_ns, end_ns, kind="internal", **attributes):
+    """Add an already finished section (e.g. timed in a worker process) under the current span."""
+    parent = _current_span.get()
+    if not TRACING_ENABLED or parent is None:
+        return
+    finished = Span(parent.trace, name, kind, attributes, parent.span_id)
+    finished.start_ns, finished.end_ns = start_ns, end_ns
+    parent.trace.spans.append(finished)
+
+
+def current_trace():
+    """The trace of the rerun running on this thread, or None."""
+    current = _current_span.get()
+    return current.trace if current is not None else None
+
+
+def traced(name=None, kind="internal"):
+    """Decorator form of span(), named after the function by default."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name or fn.__name__, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -1,13 +1,9 @@
 import streamlit as st
-from supabase import create_client
+from repositories import get_repositories
 from datetime import datetime
 import os
-
-def create_supabase_client():
-    # Replace with your actual Supabase URL and API Key
-    SUPABASE_URL = "https://your-supabase-url.supabase.co"
-    SUPABASE_KEY = "your-supabase-key"
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+from job_index import get_job_index
+from job_list import invalidate_listings
 
 def upload():
     st.title("\ud83d\udcc4 Job Listing Upload")
@@ -23,14 +19,12 @@ def upload():
 
     # Fetch parent's details from session state and database
     parent_email = st.session_state.get("email")
-    supabase = create_supabase_client()
+    repositories = get_repositories()
 
     parent_details = None
 
     try:
-        response = supabase.table("users").select("*").eq("email", parent_email).single().execute()
-        if response.get("data"):
-            parent_details = response["data"]
+        parent_details = repositories.users.get_by_email(parent_email)
     except Exception as e:
         st.error(f"Error fetching parent details: {e}")
 
@@ -139,13 +133,18 @@ def upload():
                     "special_conditions": special_conditions
                 }
 
-                response = supabase.table("job_listings").insert(data).execute()
+                listing = repositories.job_listings.create(data)
+
+                # Keep the recommendation index in step with the new listing
+                if listing:
+                    get_job_index().upsert(listing)
+                invalidate_listings(parent_email, [job_title])
 
-                if response.get("status_code") == 201:
+                if listing:
                     st.success("Job Listing Uploaded Successfully!")
                     st.balloons()
                 else:
-                    st.error(f"Error uploading job listing: {response.get('message')}")
+                    st.error("Error uploading job listing: no row was created.")
 
             except Exception as e:
                 st.error(f"Error uploading job listing: {e}")